@@ -2,8 +2,38 @@
 """Pytest configuration for multi-agent dev team tests."""
 
 import sys
-from pathlib import Path
 
-# Add project root to Python path so tests can import utils module
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+import pytest
+
+# `utils` is importable via the editable install (`pip install -e .[dev]`);
+# this file stays at the project root to anchor pytest's rootdir.
+
+
+@pytest.fixture(scope="session")
+def kb_state():
+    """Load KB state once per session and share it across tests."""
+    from utils.auto_planner import load_kb_state
+    return load_kb_state()
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    """Drop plans cached by auto_plan_feature so they don't leak between tests."""
+    yield
+    auto_planner = sys.modules.get("utils.auto_planner")
+    if auto_planner is not None:
+        auto_planner._plan_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def async_return():
+    """Factory for coroutine stubs that just return a fixed value.
+
+    Cheaper than AsyncMock for tests that never inspect calls; keep
+    AsyncMock where `.called` or call assertions are needed.
+    """
+    def make(value):
+        async def stub(*_args, **_kwargs):
+            return value
+        return stub
+    return make
@@ -0,0 +1,262 @@
+# tests/test_checkpoint_validator.py
+"""Tests for checkpoint validation and peer review."""
+
+import pytest
+import asyncio
+from utils import checkpoint_validator
+from utils.checkpoint_validator import CheckpointValidator
+from utils.dag_parser import parse_task_list, update_task_status
+
+
+class TestPeerReview:
+    """Tests for the peer review step."""
+
+    @pytest.fixture
+    def fastapi_plan(self):
+        """Create a plan whose task gets two reviewers."""
+        return {
+            'plan_id': 'review-test',
+            'tasks': {
+                'task-1': {
+                    'id': 'task-1',
+                    'title': 'Implement endpoints',
+                    'specialist': 'fastapi-specialist',
+                    'status': 'completed',
+                    'dependencies': []
+                }
+            }
+        }
+
+    def test_get_peer_reviewers(self, fastapi_plan):
+        """Test that implementation tasks get code and architecture review."""
+        validator = CheckpointValidator(fastapi_plan, 'task-1')
+
+        assert validator.get_peer_reviewers() == ['code-reviewer', 'backend-architect']
+
+    def test_peer_reviewers_cached_off_the_plan(self, fastapi_plan):
+        """Test that cached reviewer selection stays out of the task and can't be mutated."""
+        first = CheckpointValidator(fastapi_plan, 'task-1').get_peer_reviewers()
+        first.append('ui-ux')
+        second = CheckpointValidator(fastapi_plan, 'task-1').get_peer_reviewers()
+
+        assert second == ['code-reviewer', 'backend-architect']
+        assert '_reviewers' not in fastapi_plan['tasks']['task-1']
+
+    @pytest.mark.asyncio
+    async def test_reviewers_run_concurrently(self, fastapi_plan):
+        """Test that all reviewers are in flight at the same time."""
+        validator = CheckpointValidator(fastapi_plan, 'task-1')
+        active = 0
+        max_active = 0
+
+        async def mock_reviewer(reviewer):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return {'reviewer': reviewer, 'approved': True, 'issues': []}
+
+        validator.invoke_reviewer = mock_reviewer
+
+        assert await validator.peer_review() is True
+        assert max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_reviewer_error_fails_review(self, fastapi_plan):
+        """Test that a reviewer raising is treated as a rejection."""
+        validator = CheckpointValidator(fastapi_plan, 'task-1')
+
+        async def mock_reviewer(reviewer):
+            if reviewer == 'backend-architect':
+                raise RuntimeError("reviewer unavailable")
+            return {'reviewer': reviewer, 'approved': True, 'issues': []}
+
+        validator.invoke_reviewer = mock_reviewer
+
+        assert await validator.peer_review() is False
+
+    @pytest.mark.asyncio
+    async def test_primary_rejection_cancels_domain_reviews(self, fastapi_plan):
+        """Test that a code-quality rejection cancels speculative domain reviews."""
+        validator = CheckpointValidator(fastapi_plan, 'task-1')
+        finished = []
+
+        async def mock_reviewer(reviewer):
+            if reviewer == 'code-reviewer':
+                return {'reviewer': reviewer, 'approved': False, 'issues': ['Dead code']}
+            await asyncio.sleep(1)
+            finished.append(reviewer)
+            return {'reviewer': reviewer, 'approved': True, 'issues': []}
+
+        validator.invoke_reviewer = mock_reviewer
+
+        assert await validator.peer_review() is False
+        assert finished == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_review_cancels_domain_reviews(self, fastapi_plan):
+        """Test that cancelling peer review doesn't leave domain reviews running."""
+        validator = CheckpointValidator(fastapi_plan, 'task-1')
+        finished = []
+
+        async def mock_reviewer(reviewer):
+            await asyncio.sleep(0.05 if reviewer == 'code-reviewer' else 0.1)
+            finished.append(reviewer)
+            return {'reviewer': reviewer, 'approved': True, 'issues': []}
+
+        validator.invoke_reviewer = mock_reviewer
+        review = asyncio.create_task(validator.peer_review())
+        await asyncio.sleep(0.01)
+        review.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await review
+        await asyncio.sleep(0.15)
+
+        assert finished == []
+
+    @pytest.mark.asyncio
+    async def test_reviewer_concurrency_is_capped(self, fastapi_plan, monkeypatch):
+        """Test that reviewer invocations across validators share one limit."""
+        monkeypatch.setattr(checkpoint_validator, 'REVIEWER_CONCURRENCY', 3)
+        monkeypatch.setattr(checkpoint_validator, '_reviewer_sem', None)
+        active = 0
+        max_active = 0
+
+        async def mock_reviewer(reviewer):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return {'reviewer': reviewer, 'approved': True, 'issues': []}
+
+        validators = [CheckpointValidator(fastapi_plan, 'task-1') for _ in range(4)]
+        for validator in validators:
+            validator.invoke_reviewer = mock_reviewer
+
+        results = await asyncio.gather(*(v.peer_review() for v in validators))
+
+        assert all(results)
+        assert max_active == 3
+
+
+class TestCheckpointLogging:
+    """Tests for checkpoint logging."""
+
+    @pytest.mark.asyncio
+    async def test_log_records_carry_task_id(self, caplog):
+        """Test that checkpoint log records are stamped with the task being checked."""
+        plan = {
+            'plan_id': 'log-test',
+            'tasks': {
+                'task-7': {
+                    'id': 'task-7',
+                    'title': 'Review',
+                    'specialist': 'code-reviewer',
+                    'status': 'completed',
+                    'dependencies': []
+                }
+            }
+        }
+
+        with caplog.at_level('INFO', logger='utils.checkpoint_validator'):
+            assert await CheckpointValidator(plan, 'task-7').run_checkpoint() is True
+
+        assert caplog.records
+        assert all(record.task_id == 'task-7' for record in caplog.records)
+        assert checkpoint_validator.current_task_id.get() == '-'
+
+    def test_configure_logging_is_idempotent(self, capsys, monkeypatch):
+        """Test that repeated configuration installs one handler that prints the task ID."""
+        logger = checkpoint_validator.logger
+        monkeypatch.setattr(checkpoint_validator, '_log_listener', None)
+        monkeypatch.setattr(logger, 'handlers', [])
+        monkeypatch.setattr(logger, 'level', logger.level)
+
+        listener = checkpoint_validator.configure_checkpoint_logging()
+        assert checkpoint_validator.configure_checkpoint_logging() is listener
+        assert len(logger.handlers) == 1
+
+        token = checkpoint_validator.current_task_id.set('task-3')
+        try:
+            logger.info('validated')
+        finally:
+            checkpoint_validator.current_task_id.reset(token)
+        listener.stop()
+
+        assert capsys.readouterr().out == '[task-3] validated\n'
+
+
+class TestKBSync:
+    """Tests for the KB sync step."""
+
+    @pytest.mark.asyncio
+    async def test_kb_sync_detects_missing_files(self, tmp_path):
+        """Test that every listed KB update must exist (a directory counts, as with Path.exists)."""
+        (tmp_path / 'backend-patterns.md').write_text('patterns')
+        (tmp_path / 'subdir').mkdir()
+        plan = {
+            'plan_id': 'kb-test',
+            'tasks': {
+                'task-1': {
+                    'id': 'task-1',
+                    'title': 'Update patterns',
+                    'specialist': 'backend-architect',
+                    'status': 'completed',
+                    'dependencies': [],
+                    'kb_updates': [str(tmp_path / 'backend-patterns.md')]
+                }
+            }
+        }
+        validator = CheckpointValidator(plan, 'task-1')
+
+        assert await validator.kb_sync() is True
+
+        plan['tasks']['task-1']['kb_updates'].append(str(tmp_path / 'subdir'))
+        assert await validator.kb_sync() is True
+
+        for missing in ('missing.md', 'nodir/missing.md'):
+            plan['tasks']['task-1']['kb_updates'].append(str(tmp_path / missing))
+            assert await validator.kb_sync() is False
+            plan['tasks']['task-1']['kb_updates'].pop()
+
+
+class TestFinalApproval:
+    """Tests for the final approval step."""
+
+    def test_dependents_transition_to_ready(self):
+        """Test that only dependents with all dependencies satisfied become ready."""
+        plan = parse_task_list([
+            "backend-architect: Design API",
+            "ui-ux: Design UI",
+            "fastapi-specialist: Implement API (depends on: 1)",
+            "code-reviewer: Review (depends on: 1, 2)"
+        ])
+        update_task_status(plan, 'task-1', 'completed')
+
+        CheckpointValidator(plan, 'task-1').final_approval()
+
+        assert plan['tasks']['task-1']['status'] == 'validated'
+        assert plan['tasks']['task-3']['status'] == 'ready'
+        assert plan['tasks']['task-4']['status'] == 'pending'
+
+    def test_shared_dependent_released_by_last_approval(self):
+        """Test that a task depending on two approved tasks becomes ready only after both."""
+        plan = parse_task_list([
+            "backend-architect: Design API",
+            "ui-ux: Design UI",
+            "code-reviewer: Review (depends on: 1, 2)"
+        ])
+        update_task_status(plan, 'task-1', 'completed')
+        CheckpointValidator(plan, 'task-1').final_approval()
+        assert plan['tasks']['task-3']['status'] == 'pending'
+
+        update_task_status(plan, 'task-2', 'completed')
+        CheckpointValidator(plan, 'task-2').final_approval()
+        assert plan['tasks']['task-3']['status'] == 'ready'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
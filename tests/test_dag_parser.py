@@ -0,0 +1,178 @@
+# tests/test_dag_parser.py
+"""Tests for task list parsing and DAG helpers."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import jsonschema
+import pytest
+from utils.dag_parser import (
+    parse_task_list,
+    get_ready_tasks,
+    update_task_status,
+    build_dependents_index,
+    compute_indegrees,
+    compute_critical_path_depth,
+    compute_root_depth,
+    detect_cycles,
+    CircularDependencyError,
+)
+from utils import dag_numba
+
+
+def test_parsed_plan_is_json_and_matches_schema():
+    """Test that a parsed plan serializes to JSON and validates against task-dag.schema.json."""
+    schema_path = Path(__file__).resolve().parent.parent / "schemas" / "task-dag.schema.json"
+    schema = json.loads(schema_path.read_text())
+    plan = parse_task_list([
+        "backend-architect: Design login endpoint",
+        "fastapi-specialist: Implement /api/v1/auth/login (depends on: 1)"
+    ])
+
+    round_tripped = json.loads(json.dumps(plan))
+
+    jsonschema.validate(round_tripped, schema)
+    assert round_tripped["tasks"]["task-2"]["dependencies"] == ["task-1"]
+
+
+def test_dag_parser_multiple_dependencies():
+    """Test parsing lines with several dependencies and loose spacing."""
+    plan = parse_task_list([
+        "backend-architect: Design API",
+        "ui-ux: Design login page",
+        "Code Reviewer :  Review: API and UI  (depends on: 1,  2)"
+    ])
+
+    task = plan["tasks"]["task-3"]
+    assert task["specialist"] == "code-reviewer"
+    assert task["title"] == "Review: API and UI"
+    assert task["dependencies"] == ["task-1", "task-2"]
+
+
+def test_dag_parser_dependency_suffix_edge_cases():
+    """Test unterminated suffixes, "(depends on:" in titles and repeated references."""
+    plan = parse_task_list([
+        "backend-architect: Design API",
+        "ui-ux: Fix layout (depends on: 1",
+        "code-reviewer: Explain (depends on: 1) wording",
+        "no specialist line",
+        "docker-specialist: Package (depends on: 2, 1, 2)"
+    ])
+
+    assert plan["tasks"]["task-2"]["title"] == "Fix layout"
+    assert plan["tasks"]["task-2"]["dependencies"] == ["task-1"]
+    assert plan["tasks"]["task-3"]["title"] == "Explain (depends on: 1) wording"
+    assert plan["tasks"]["task-3"]["dependencies"] == []
+    assert "task-4" not in plan["tasks"]
+    assert plan["tasks"]["task-5"]["dependencies"] == ["task-2", "task-1"]
+
+
+def test_detect_cycles_reports_path():
+    """Test that a cycle is reported with its dependency path."""
+    with pytest.raises(CircularDependencyError, match="task-1 -> task-3 -> task-2 -> task-1"):
+        parse_task_list([
+            "backend-architect: Design (depends on: 3)",
+            "fastapi-specialist: Build (depends on: 1)",
+            "code-reviewer: Review (depends on: 2)"
+        ])
+
+
+def test_detect_cycles_handles_long_chains():
+    """Test that chains deeper than the recursion limit are checked."""
+    n = 5000
+    tasks = {
+        f"task-{i}": {"dependencies": [f"task-{i + 1}"] if i < n else []}
+        for i in range(1, n + 1)
+    }
+
+    detect_cycles({"tasks": tasks})
+
+    tasks[f"task-{n}"]["dependencies"] = ["task-1"]
+    with pytest.raises(CircularDependencyError):
+        detect_cycles({"tasks": tasks})
+
+
+def test_ready_tasks_follow_direct_status_writes():
+    """Test that readiness reflects statuses written directly or reloaded from JSON."""
+    plan = parse_task_list([
+        "backend-architect: Design API",
+        "fastapi-specialist: Implement API (depends on: 1)",
+        "code-reviewer: Review (depends on: 1, 2)"
+    ])
+
+    plan["tasks"]["task-1"]["status"] = "completed"
+    assert get_ready_tasks(plan) == ["task-2"]
+
+    reloaded = json.loads(json.dumps(plan))
+    reloaded["tasks"]["task-2"]["status"] = "validated"
+    assert get_ready_tasks(reloaded) == ["task-3"]
+
+    # Reopening a task blocks its dependents again
+    update_task_status(plan, "task-1", "pending")
+    assert get_ready_tasks(plan) == ["task-1"]
+    assert set(plan) == {"plan_id", "created_at", "tasks"}
+
+
+def test_dependents_index_and_indegrees():
+    """Test reverse-dependency index and unsatisfied dependency counts."""
+    plan = {
+        "plan_id": "test",
+        "tasks": {
+            "task-1": {"status": "completed", "dependencies": []},
+            "task-2": {"status": "pending", "dependencies": ["task-1"]},
+            "task-3": {"status": "pending", "dependencies": ["task-1", "task-2"]}
+        }
+    }
+
+    assert build_dependents_index(plan) == {
+        "task-1": ["task-2", "task-3"],
+        "task-2": ["task-3"],
+        "task-3": []
+    }
+    assert compute_indegrees(plan) == {"task-1": 0, "task-2": 0, "task-3": 1}
+
+
+def test_critical_path_depth():
+    """Test critical-path and root depths count the longest chains each way."""
+    plan = parse_task_list([
+        "backend-architect: Design",
+        "backend-design: Schema (depends on: 1)",
+        "fastapi-specialist: Endpoints (depends on: 2)",
+        "ui-ux: Login UI (depends on: 1)",
+        "code-reviewer: Review (depends on: 3, 4)"
+    ])
+
+    depth = compute_critical_path_depth(plan)
+
+    assert depth == {"task-1": 4, "task-2": 3, "task-3": 2, "task-4": 2, "task-5": 1}
+
+    level = compute_root_depth(plan)
+
+    assert level == {"task-1": 0, "task-2": 1, "task-3": 2, "task-4": 1, "task-5": 3}
+
+
+def test_dag_kernels_match_pure_python():
+    """Test that the array kernel agrees with the dict-based critical-path DP."""
+    plan = parse_task_list([
+        "backend-architect: Design API",
+        "fastapi-specialist: Implement API (depends on: 1)",
+        "ui-ux: Design UI (depends on: 1)",
+        "javascript-specialist: Implement UI (depends on: 3)",
+        "code-reviewer: Review (depends on: 2, 4)"
+    ])
+
+    assert dag_numba.critical_path_depth(plan) == compute_critical_path_depth(plan)
+
+
+def test_dag_parser_does_not_import_kernels():
+    """Test that importing dag_parser leaves numba/numpy unloaded until a large plan needs them."""
+    code = "import sys, utils.dag_parser; sys.exit('utils.dag_numba' in sys.modules)"
+    root = Path(__file__).resolve().parent.parent
+
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
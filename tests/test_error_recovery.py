@@ -1,21 +1,24 @@
 # tests/test_error_recovery.py
 """Tests for error recovery system."""
 
+import copy
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
-from utils.error_recovery import (
-    ErrorRecovery,
-    FailureType,
-    handle_task_failure
-)
+
+
+@pytest.fixture(scope="session")
+def error_recovery():
+    """Import the recovery module lazily so collection doesn't pay for it."""
+    import utils.error_recovery as module
+    return module
 
 
 class TestFailureClassification:
     """Tests for failure classification logic."""
 
-    @pytest.fixture
-    def sample_plan(self):
+    @pytest.fixture(scope="module")
+    def _sample_plan_template(self):
         """Create a sample plan for testing."""
         return {
             'plan_id': 'test-plan',
@@ -44,43 +47,68 @@ class TestFailureClassification:
             }
         }
 
-    def test_classify_fixable_failure(self, sample_plan):
+    @pytest.fixture
+    def sample_plan(self, _sample_plan_template):
+        """Check out an isolated copy of the template plan."""
+        return copy.deepcopy(_sample_plan_template)
+
+    @pytest.mark.parametrize("error_msg", [
+        "Information unclear, need clarification",
+        "Missing required parameter",
+        "Data not found in upstream task",
+        "Need more information about requirements"
+    ])
+    def test_classify_fixable_failure(self, error_recovery, sample_plan, error_msg):
         """Test classification of fixable failures."""
-        recovery = ErrorRecovery(sample_plan, 'task-2')
-
-        # Test with fixable keywords
-        fixable_errors = [
-            Exception("Information unclear, need clarification"),
-            Exception("Missing required parameter"),
-            Exception("Data not found in upstream task"),
-            Exception("Need more information about requirements")
-        ]
-
-        for error in fixable_errors:
-            context = recovery.capture_failure_context(error)
-            failure_type = recovery.classify_failure(error, context)
-            assert failure_type == FailureType.FIXABLE
-
-    def test_classify_fundamental_failure(self, sample_plan):
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
+        error = Exception(error_msg)
+
+        context = recovery.capture_failure_context(error)
+        failure_type = recovery.classify_failure(error, context)
+        assert failure_type == error_recovery.FailureType.FIXABLE
+
+    @pytest.mark.parametrize("error_msg", [
+        "Impossible to implement this architecture",
+        "Conflict with existing system design",
+        "Incompatible with current infrastructure",
+        "Cannot violate architectural constraints"
+    ])
+    def test_classify_fundamental_failure(self, error_recovery, sample_plan, error_msg):
         """Test classification of fundamental failures."""
-        recovery = ErrorRecovery(sample_plan, 'task-2')
-
-        # Test with fundamental keywords
-        fundamental_errors = [
-            Exception("Impossible to implement this architecture"),
-            Exception("Conflict with existing system design"),
-            Exception("Incompatible with current infrastructure"),
-            Exception("Cannot violate architectural constraints")
-        ]
-
-        for error in fundamental_errors:
-            context = recovery.capture_failure_context(error)
-            failure_type = recovery.classify_failure(error, context)
-            assert failure_type == FailureType.FUNDAMENTAL
-
-    def test_classify_by_retry_count(self, sample_plan):
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
+        error = Exception(error_msg)
+
+        context = recovery.capture_failure_context(error)
+        failure_type = recovery.classify_failure(error, context)
+        assert failure_type == error_recovery.FailureType.FUNDAMENTAL
+
+    def test_classify_fundamental_wins_over_fixable(self, error_recovery, sample_plan):
+        """Test that fundamental keywords take precedence when both kinds appear."""
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
+        error = Exception("Missing schema field causes a conflict with the API")
+
+        context = recovery.capture_failure_context(error)
+        failure_type = recovery.classify_failure(error, context)
+        assert failure_type == error_recovery.FailureType.FUNDAMENTAL
+
+    @pytest.mark.parametrize("error_msg, expected", [
+        ("Conflicts with existing routes", "FUNDAMENTAL"),
+        ("Preconflict hook failed", "FIXABLE"),
+        ("Unmissing marker", "FIXABLE"),
+    ])
+    def test_classify_keywords_start_words(self, error_recovery, sample_plan, error_msg, expected):
+        """Test that keywords match inflected words but not the middle of words."""
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
+        error = Exception(error_msg)
+
+        context = recovery.capture_failure_context(error)
+        context['retry_count'] = 0  # no keyword match defaults to FIXABLE
+        failure_type = recovery.classify_failure(error, context)
+        assert failure_type == error_recovery.FailureType[expected]
+
+    def test_classify_by_retry_count(self, error_recovery, sample_plan):
         """Test that retry count affects classification."""
-        recovery = ErrorRecovery(sample_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
 
         error = Exception("Generic error")
 
@@ -88,19 +116,19 @@ class TestFailureClassification:
         context = recovery.capture_failure_context(error)
         context['retry_count'] = 1
         failure_type = recovery.classify_failure(error, context)
-        assert failure_type == FailureType.FIXABLE
+        assert failure_type == error_recovery.FailureType.FIXABLE
 
         # With max retries exceeded, should be fundamental
         context['retry_count'] = 3
         failure_type = recovery.classify_failure(error, context)
-        assert failure_type == FailureType.FUNDAMENTAL
+        assert failure_type == error_recovery.FailureType.FUNDAMENTAL
 
 
 class TestFailureContext:
     """Tests for failure context capture."""
 
-    @pytest.fixture
-    def sample_plan(self):
+    @pytest.fixture(scope="module")
+    def _sample_plan_template(self):
         """Create a sample plan."""
         return {
             'plan_id': 'test',
@@ -117,9 +145,14 @@ class TestFailureContext:
             }
         }
 
-    def test_capture_failure_context(self, sample_plan):
+    @pytest.fixture
+    def sample_plan(self, _sample_plan_template):
+        """Check out an isolated copy of the template plan."""
+        return copy.deepcopy(_sample_plan_template)
+
+    def test_capture_failure_context(self, error_recovery, sample_plan):
         """Test that failure context is captured correctly."""
-        recovery = ErrorRecovery(sample_plan, 'task-1')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
         error = Exception("Test error message")
 
         context = recovery.capture_failure_context(error)
@@ -137,8 +170,8 @@ class TestFailureContext:
 class TestFixableFailureRecovery:
     """Tests for fixable failure recovery logic."""
 
-    @pytest.fixture
-    def sample_plan(self):
+    @pytest.fixture(scope="module")
+    def _sample_plan_template(self):
         """Create plan with dependencies."""
         return {
             'plan_id': 'test',
@@ -162,10 +195,21 @@ class TestFixableFailureRecovery:
             }
         }
 
+    @pytest.fixture
+    def sample_plan(self, _sample_plan_template):
+        """Check out an isolated copy of the template plan."""
+        return copy.deepcopy(_sample_plan_template)
+
+    @pytest.fixture
+    def sample_plan_no_deps(self, sample_plan):
+        """Variant of the plan where the failed task has no prerequisites."""
+        sample_plan['tasks']['task-2']['dependencies'] = []
+        return sample_plan
+
     @pytest.mark.asyncio
-    async def test_handle_fixable_failure_under_retry_limit(self, sample_plan):
+    async def test_handle_fixable_failure_under_retry_limit(self, error_recovery, sample_plan, kb_state):
         """Test handling fixable failure with retries remaining."""
-        recovery = ErrorRecovery(sample_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
 
         context = {
             'task_id': 'task-2',
@@ -174,7 +218,7 @@ class TestFixableFailureRecovery:
             'retry_count': 1,
             'dependencies': ['task-1'],
             'workspace_files': [],
-            'kb_state': {}
+            'kb_state': kb_state
         }
 
         # Mock recovery attempt
@@ -187,9 +231,9 @@ class TestFixableFailureRecovery:
         assert sample_plan['tasks']['task-2']['retry_count'] == 2
 
     @pytest.mark.asyncio
-    async def test_handle_fixable_failure_exceeds_retry_limit(self, sample_plan):
+    async def test_handle_fixable_failure_exceeds_retry_limit(self, error_recovery, sample_plan, kb_state):
         """Test handling fixable failure with max retries exceeded."""
-        recovery = ErrorRecovery(sample_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
 
         context = {
             'task_id': 'task-2',
@@ -198,7 +242,7 @@ class TestFixableFailureRecovery:
             'retry_count': 3,  # Max retries
             'dependencies': ['task-1'],
             'workspace_files': [],
-            'kb_state': {}
+            'kb_state': kb_state
         }
 
         result = await recovery.handle_fixable_failure(context)
@@ -206,9 +250,9 @@ class TestFixableFailureRecovery:
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_attempt_recovery_with_dependencies(self, sample_plan):
+    async def test_attempt_recovery_with_dependencies(self, error_recovery, sample_plan, kb_state):
         """Test recovery attempt loops back to prerequisite task."""
-        recovery = ErrorRecovery(sample_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-2')
 
         context = {
             'task_id': 'task-2',
@@ -217,7 +261,7 @@ class TestFixableFailureRecovery:
             'retry_count': 1,
             'dependencies': ['task-1'],
             'workspace_files': [],
-            'kb_state': {}
+            'kb_state': kb_state
         }
 
         # Mock get_clarification
@@ -229,12 +273,9 @@ class TestFixableFailureRecovery:
         assert recovery.get_clarification.called
 
     @pytest.mark.asyncio
-    async def test_attempt_recovery_no_dependencies(self, sample_plan):
+    async def test_attempt_recovery_no_dependencies(self, error_recovery, sample_plan_no_deps, kb_state):
         """Test recovery fails when no dependencies to loop back to."""
-        # Remove dependencies
-        sample_plan['tasks']['task-2']['dependencies'] = []
-
-        recovery = ErrorRecovery(sample_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(sample_plan_no_deps, 'task-2')
 
         context = {
             'task_id': 'task-2',
@@ -243,7 +284,7 @@ class TestFixableFailureRecovery:
             'retry_count': 1,
             'dependencies': [],
             'workspace_files': [],
-            'kb_state': {}
+            'kb_state': kb_state
         }
 
         result = await recovery.attempt_recovery(context)
@@ -254,8 +295,8 @@ class TestFixableFailureRecovery:
 class TestFundamentalFailureHandling:
     """Tests for fundamental failure handling."""
 
-    @pytest.fixture
-    def sample_plan(self):
+    @pytest.fixture(scope="module")
+    def _sample_plan_template(self):
         """Create plan with dependents."""
         return {
             'plan_id': 'test',
@@ -291,10 +332,15 @@ class TestFundamentalFailureHandling:
             }
         }
 
+    @pytest.fixture
+    def sample_plan(self, _sample_plan_template):
+        """Check out an isolated copy of the template plan."""
+        return copy.deepcopy(_sample_plan_template)
+
     @pytest.mark.asyncio
-    async def test_fundamental_failure_blocks_dependents(self, sample_plan):
+    async def test_fundamental_failure_blocks_dependents(self, error_recovery, sample_plan, kb_state):
         """Test that fundamental failure blocks all dependent tasks."""
-        recovery = ErrorRecovery(sample_plan, 'task-1')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
 
         context = {
             'task_id': 'task-1',
@@ -303,7 +349,7 @@ class TestFundamentalFailureHandling:
             'retry_count': 0,
             'dependencies': [],
             'workspace_files': [],
-            'kb_state': {}
+            'kb_state': kb_state
         }
 
         result = await recovery.handle_fundamental_failure(context)
@@ -322,9 +368,31 @@ class TestFundamentalFailureHandling:
         assert sample_plan['tasks']['task-4']['status'] == 'pending'
 
     @pytest.mark.asyncio
-    async def test_failure_report_generation(self, sample_plan):
+    async def test_fundamental_failure_walks_dependents_once(
+        self, error_recovery, sample_plan, kb_state, monkeypatch
+    ):
+        """Test that blocking and reporting share one downstream traversal."""
+        lookups = []
+        real_index = error_recovery.build_dependents_index
+        monkeypatch.setattr(
+            error_recovery, 'build_dependents_index',
+            lambda plan: lookups.append(plan) or real_index(plan)
+        )
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
+        context = {
+            'error_message': 'Impossible architecture',
+            'retry_count': 0,
+            'dependencies': []
+        }
+
+        await recovery.handle_fundamental_failure(context)
+
+        assert len(lookups) == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_report_generation(self, error_recovery, sample_plan, kb_state):
         """Test that failure report is generated correctly."""
-        recovery = ErrorRecovery(sample_plan, 'task-1')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
 
         context = {
             'task_id': 'task-1',
@@ -333,7 +401,7 @@ class TestFundamentalFailureHandling:
             'retry_count': 2,
             'dependencies': [],
             'workspace_files': [],
-            'kb_state': {}
+            'kb_state': kb_state
         }
 
         report = recovery.generate_failure_report(context)
@@ -349,8 +417,8 @@ class TestFundamentalFailureHandling:
 class TestErrorRecoveryIntegration:
     """Integration tests for full error recovery flow."""
 
-    @pytest.fixture
-    def full_plan(self):
+    @pytest.fixture(scope="module")
+    def _full_plan_template(self):
         """Create a complete plan for integration testing."""
         return {
             'plan_id': 'integration-test',
@@ -380,8 +448,13 @@ class TestErrorRecoveryIntegration:
             }
         }
 
+    @pytest.fixture
+    def full_plan(self, _full_plan_template):
+        """Check out an isolated copy of the template plan."""
+        return copy.deepcopy(_full_plan_template)
+
     @pytest.mark.asyncio
-    async def test_handle_task_failure_function(self, full_plan):
+    async def test_handle_task_failure_function(self, error_recovery, full_plan):
         """Test the handle_task_failure convenience function."""
         error = Exception("Need clarification on API design")
 
@@ -390,7 +463,7 @@ class TestErrorRecoveryIntegration:
             mock_instance = MockRecovery.return_value
             mock_instance.handle_failure = AsyncMock(return_value=True)
 
-            result = await handle_task_failure(full_plan, 'task-2', error)
+            result = await error_recovery.handle_task_failure(full_plan, 'task-2', error)
 
             # Verify ErrorRecovery was created and used
             MockRecovery.assert_called_once_with(full_plan, 'task-2')
@@ -400,12 +473,12 @@ class TestErrorRecoveryIntegration:
             assert result is True
 
     @pytest.mark.asyncio
-    async def test_full_recovery_flow_fixable(self, full_plan):
+    async def test_full_recovery_flow_fixable(self, error_recovery, full_plan, async_return):
         """Test complete recovery flow for fixable error."""
-        recovery = ErrorRecovery(full_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(full_plan, 'task-2')
 
         # Mock methods
-        recovery.get_clarification = AsyncMock(return_value="Clarification")
+        recovery.get_clarification = async_return("Clarification")
         recovery.update_workspace_with_clarification = MagicMock()
 
         error = Exception("Unclear API requirements")
@@ -416,9 +489,9 @@ class TestErrorRecoveryIntegration:
         assert full_plan['tasks']['task-2'].get('retry_count', 0) > 0
 
     @pytest.mark.asyncio
-    async def test_full_recovery_flow_fundamental(self, full_plan):
+    async def test_full_recovery_flow_fundamental(self, error_recovery, full_plan):
         """Test complete recovery flow for fundamental error."""
-        recovery = ErrorRecovery(full_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(full_plan, 'task-2')
 
         error = Exception("Impossible to implement this architecture")
         result = await recovery.handle_failure(error)
@@ -429,12 +502,12 @@ class TestErrorRecoveryIntegration:
         assert full_plan['tasks']['task-3']['status'] == 'blocked'
 
     @pytest.mark.asyncio
-    async def test_max_retry_transitions_to_fundamental(self, full_plan):
+    async def test_max_retry_transitions_to_fundamental(self, error_recovery, full_plan):
         """Test that exceeding max retries transitions to fundamental failure."""
         # Set retry count to max
         full_plan['tasks']['task-2']['retry_count'] = 3
 
-        recovery = ErrorRecovery(full_plan, 'task-2')
+        recovery = error_recovery.ErrorRecovery(full_plan, 'task-2')
 
         error = Exception("Generic error")
         result = await recovery.handle_failure(error)
@@ -446,8 +519,8 @@ class TestErrorRecoveryIntegration:
 class TestHelperMethods:
     """Tests for helper methods."""
 
-    @pytest.fixture
-    def sample_plan(self):
+    @pytest.fixture(scope="module")
+    def _sample_plan_template(self):
         """Create sample plan."""
         return {
             'plan_id': 'test',
@@ -462,9 +535,14 @@ class TestHelperMethods:
             }
         }
 
-    def test_extract_clarification_question(self, sample_plan):
+    @pytest.fixture
+    def sample_plan(self, _sample_plan_template):
+        """Check out an isolated copy of the template plan."""
+        return copy.deepcopy(_sample_plan_template)
+
+    def test_extract_clarification_question(self, error_recovery, sample_plan):
         """Test extracting clarification question from error."""
-        recovery = ErrorRecovery(sample_plan, 'task-1')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
 
         context = {
             'error_message': 'Missing parameter X'
@@ -475,7 +553,7 @@ class TestHelperMethods:
         assert 'Missing parameter X' in question
         assert 'Clarification' in question or 'clarification' in question
 
-    def test_block_task_and_dependents(self, sample_plan):
+    def test_block_task_and_dependents(self, error_recovery, sample_plan):
         """Test blocking task and all dependents."""
         # Add dependent tasks
         sample_plan['tasks']['task-2'] = {
@@ -493,7 +571,7 @@ class TestHelperMethods:
             'dependencies': []
         }
 
-        recovery = ErrorRecovery(sample_plan, 'task-1')
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
         recovery.block_task_and_dependents()
 
         # Failed task should be blocked
@@ -505,6 +583,29 @@ class TestHelperMethods:
         # Independent should remain pending
         assert sample_plan['tasks']['task-3']['status'] == 'pending'
 
+    def test_block_transitive_dependents(self, error_recovery, sample_plan):
+        """Test blocking reaches dependents of dependents."""
+        for i, deps in ((2, ['task-1']), (3, ['task-2']), (4, [])):
+            sample_plan['tasks'][f'task-{i}'] = {
+                'id': f'task-{i}',
+                'title': f'Task {i}',
+                'specialist': 'fastapi-specialist',
+                'status': 'pending',
+                'dependencies': deps
+            }
+
+        recovery = error_recovery.ErrorRecovery(sample_plan, 'task-1')
+        assert recovery.find_downstream_tasks() == ['task-2', 'task-3']
+
+        recovery.block_task_and_dependents()
+
+        assert sample_plan['tasks']['task-3']['status'] == 'blocked'
+        assert sample_plan['tasks']['task-4']['status'] == 'pending'
+
+        # The whole cascade shares one timestamp
+        stamps = {sample_plan['tasks'][f'task-{i}']['completed_at'] for i in (1, 2, 3)}
+        assert len(stamps) == 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -3,7 +3,6 @@
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
 from pathlib import Path
 from utils.auto_planner import auto_plan_feature, analyze_domains, synthesize_plan
 from utils.parallel_executor import ParallelExecutor, execute_plan_parallel
@@ -12,11 +11,46 @@ from utils.dag_parser import parse_task_list, get_ready_tasks, update_task_statu
 from utils.checkpoint_validator import CheckpointValidator
 
 
+def _fullstack_feature_plan():
+    """Synthesized plan for a feature spanning backend and frontend."""
+    feature = "Add user profile UI component with API endpoint"
+    specialist_responses = {
+        'backend-architect': 'Design profile API',
+        'fastapi-specialist': 'Implement profile endpoints',
+        'ui-ux': 'Design profile UI',
+        'javascript-specialist': 'Implement profile component'
+    }
+    return synthesize_plan(feature, specialist_responses, analyze_domains(feature))
+
+
+def _multi_stage_feature_plan():
+    """Parsed plan: Design -> Backend -> Frontend -> Integration."""
+    return parse_task_list([
+        "backend-architect: Design authentication system",
+        "backend-design: Design database schema (depends on: 1)",
+        "fastapi-specialist: Implement auth endpoints (depends on: 2)",
+        "ui-ux: Design login UI (depends on: 1)",
+        "javascript-specialist: Implement login component (depends on: 4)",
+        "code-reviewer: Integration testing (depends on: 3, 5)"
+    ])
+
+
+def _health_check_plan():
+    """Synthesized plan for a small backend-only feature."""
+    feature = "Add health check endpoint to API"
+    specialist_responses = {
+        'backend-architect': 'Design health check',
+        'fastapi-specialist': 'Implement /health endpoint',
+        'code-reviewer': 'Review implementation'
+    }
+    return synthesize_plan(feature, specialist_responses, analyze_domains(feature))
+
+
 class TestEndToEndWorkflow:
     """Integration tests for complete workflow: plan → execute → checkpoint → complete."""
 
     @pytest.mark.asyncio
-    async def test_simple_feature_end_to_end(self):
+    async def test_simple_feature_end_to_end(self, async_return):
         """Test complete workflow for a simple feature."""
         # Step 1: Analyze domains
         feature_description = "Add login API endpoint"
@@ -41,7 +75,7 @@ class TestEndToEndWorkflow:
         executor = ParallelExecutor(plan)
 
         async def mock_specialist_invoke(specialist, task_title, task_id):
-            await asyncio.sleep(0.05)  # Simulate work
+            await asyncio.sleep(0)  # Yield to the event loop
             return {
                 'task_id': task_id,
                 'specialist': specialist,
@@ -51,7 +85,7 @@ class TestEndToEndWorkflow:
             }
 
         executor.invoke_specialist = mock_specialist_invoke
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         await executor.execute_plan()
 
@@ -60,43 +94,7 @@ class TestEndToEndWorkflow:
             assert task['status'] == 'completed'
 
     @pytest.mark.asyncio
-    async def test_fullstack_feature_workflow(self):
-        """Test workflow for feature spanning backend and frontend."""
-        # Feature requiring both backend and frontend work
-        feature_description = "Add user profile UI component with API endpoint"
-        domains = analyze_domains(feature_description)
-
-        assert 'backend' in domains or 'frontend' in domains
-        # Should detect at least one domain (may default to both if only one detected)
-
-        # Create plan with both backend and frontend specialists
-        specialist_responses = {
-            'backend-architect': 'Design profile API',
-            'fastapi-specialist': 'Implement profile endpoints',
-            'ui-ux': 'Design profile UI',
-            'javascript-specialist': 'Implement profile component'
-        }
-
-        plan = synthesize_plan(feature_description, specialist_responses, domains)
-
-        # Execute plan
-        executor = ParallelExecutor(plan)
-        executor.invoke_specialist = AsyncMock(return_value={
-            'task_id': 'mock',
-            'specialist': 'mock',
-            'output': 'Done',
-            'workspace_files': ['output.md'],
-            'kb_updates': []
-        })
-        executor.run_checkpoint = AsyncMock()
-
-        await executor.execute_plan()
-
-        # Verify completion
-        assert all(t['status'] == 'completed' for t in plan['tasks'].values())
-
-    @pytest.mark.asyncio
-    async def test_workflow_with_parallel_execution(self):
+    async def test_workflow_with_parallel_execution(self, async_return):
         """Test workflow with tasks that can run in parallel."""
         # Create plan with parallel-ready tasks
         plan = {
@@ -135,9 +133,8 @@ class TestEndToEndWorkflow:
         execution_times = {}
 
         async def mock_invoke(specialist, task_title, task_id):
-            import time
-            execution_times[task_id] = time.time()
-            await asyncio.sleep(0.1)
+            execution_times[task_id] = asyncio.get_running_loop().time()
+            await asyncio.sleep(0)
             return {
                 'task_id': task_id,
                 'specialist': specialist,
@@ -148,7 +145,7 @@ class TestEndToEndWorkflow:
 
         executor = ParallelExecutor(plan)
         executor.invoke_specialist = mock_invoke
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         await executor.execute_plan()
 
@@ -160,7 +157,7 @@ class TestEndToEndWorkflow:
         assert all(t['status'] == 'completed' for t in plan['tasks'].values())
 
     @pytest.mark.asyncio
-    async def test_workflow_with_checkpoint_validation(self):
+    async def test_workflow_with_checkpoint_validation(self, async_return):
         """Test that checkpoints are validated during execution."""
         plan = {
             'plan_id': 'checkpoint-test',
@@ -186,7 +183,7 @@ class TestEndToEndWorkflow:
                 'result': result
             })
 
-        executor.invoke_specialist = AsyncMock(return_value={
+        executor.invoke_specialist = async_return({
             'task_id': 'task-1',
             'specialist': 'backend-architect',
             'output': 'Done',
@@ -207,7 +204,7 @@ class TestErrorRecoveryIntegration:
     """Integration tests for error recovery in full workflow."""
 
     @pytest.mark.asyncio
-    async def test_workflow_with_fixable_failure(self):
+    async def test_workflow_with_fixable_failure(self, async_return):
         """Test workflow recovers from fixable failure."""
         plan = {
             'plan_id': 'recovery-test',
@@ -248,7 +245,7 @@ class TestErrorRecoveryIntegration:
 
         executor = ParallelExecutor(plan)
         executor.invoke_specialist = mock_invoke
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         # First execution should fail task-2
         await executor.execute_task('task-2')
@@ -257,7 +254,7 @@ class TestErrorRecoveryIntegration:
         # Attempt recovery
         error = Exception("Unclear requirement - need clarification")
         recovery = ErrorRecovery(plan, 'task-2')
-        recovery.get_clarification = AsyncMock(return_value="Clarification")
+        recovery.get_clarification = async_return("Clarification")
 
         can_retry = await recovery.handle_failure(error)
         assert can_retry is True
@@ -268,7 +265,7 @@ class TestErrorRecoveryIntegration:
         assert plan['tasks']['task-2']['status'] == 'completed'
 
     @pytest.mark.asyncio
-    async def test_workflow_with_fundamental_failure(self):
+    async def test_workflow_with_fundamental_failure(self, async_return):
         """Test workflow handles fundamental failure by blocking dependents."""
         plan = {
             'plan_id': 'fundamental-failure-test',
@@ -310,7 +307,7 @@ class TestErrorRecoveryIntegration:
 
         executor = ParallelExecutor(plan)
         executor.invoke_specialist = mock_invoke
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         # Execute task-1 (will fail)
         await executor.execute_task('task-1')
@@ -333,39 +330,34 @@ class TestErrorRecoveryIntegration:
 class TestComplexScenarios:
     """Tests for complex real-world scenarios."""
 
-    @pytest.mark.asyncio
-    async def test_multi_stage_feature_with_dependencies(self):
-        """Test complex feature with multiple stages and dependencies."""
-        # Simulate: Design → Backend → Frontend → Integration
-        task_lines = [
-            "backend-architect: Design authentication system",
-            "backend-design: Design database schema (depends on: 1)",
-            "fastapi-specialist: Implement auth endpoints (depends on: 2)",
-            "ui-ux: Design login UI (depends on: 1)",
-            "javascript-specialist: Implement login component (depends on: 4)",
-            "code-reviewer: Integration testing (depends on: 3, 5)"
-        ]
-
-        plan = parse_task_list(task_lines)
-
-        # Execute with mocked specialists
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize("build_plan, task_count", [
+        (_fullstack_feature_plan, 4),
+        (_multi_stage_feature_plan, 6),
+        (_health_check_plan, 3),
+    ], ids=["fullstack", "multi-stage", "health-check"])
+    async def test_plan_runs_to_completion(self, build_plan, task_count, async_return):
+        """Test that plans from each planning path execute to completion."""
+        plan = build_plan()
+        assert len(plan['tasks']) == task_count
+
         executor = ParallelExecutor(plan)
-        executor.invoke_specialist = AsyncMock(return_value={
+        executor.invoke_specialist = async_return({
             'task_id': 'mock',
             'specialist': 'mock',
             'output': 'Done',
-            'workspace_files': [],
+            'workspace_files': ['work/output.md'],
             'kb_updates': []
         })
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         await executor.execute_plan()
 
-        # Verify all completed in correct order
+        assert executor.is_plan_complete()
         assert all(t['status'] == 'completed' for t in plan['tasks'].values())
 
     @pytest.mark.asyncio
-    async def test_partial_failure_continues_independent_work(self):
+    async def test_partial_failure_continues_independent_work(self, async_return):
         """Test that partial failure doesn't block independent work."""
         plan = {
             'plan_id': 'partial-failure-test',
@@ -416,7 +408,7 @@ class TestComplexScenarios:
 
         executor = ParallelExecutor(plan)
         executor.invoke_specialist = mock_invoke
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         # Execute and handle failures
         await executor.execute_task('task-1')
@@ -438,47 +430,6 @@ class TestComplexScenarios:
         assert plan['tasks']['task-3']['status'] == 'completed'
         assert plan['tasks']['task-4']['status'] == 'completed'
 
-    @pytest.mark.asyncio
-    async def test_plan_to_completion_workflow(self):
-        """Test complete workflow from planning to completion."""
-        # Step 1: Feature description
-        feature = "Add health check endpoint to API"
-
-        # Step 2: Domain analysis
-        domains = analyze_domains(feature)
-        assert 'backend' in domains
-
-        # Step 3: Plan generation
-        specialist_responses = {
-            'backend-architect': 'Design health check',
-            'fastapi-specialist': 'Implement /health endpoint',
-            'code-reviewer': 'Review implementation'
-        }
-        plan = synthesize_plan(feature, specialist_responses, domains)
-
-        # Step 4: Execution
-        executor = ParallelExecutor(plan)
-        executor.invoke_specialist = AsyncMock(return_value={
-            'task_id': 'mock',
-            'specialist': 'mock',
-            'output': 'Completed',
-            'workspace_files': ['work/output.md'],
-            'kb_updates': ['patterns/api-health-check.md']
-        })
-        executor.run_checkpoint = AsyncMock()
-
-        await executor.execute_plan()
-
-        # Step 5: Validation
-        assert executor.is_plan_complete()
-        assert all(t['status'] == 'completed' for t in plan['tasks'].values())
-
-        # Note: output_workspace is set by run_checkpoint in real implementation
-        # In this test, we're using AsyncMock for run_checkpoint, so it doesn't populate output_workspace
-        # Just verify tasks are complete
-        assert len(plan['tasks']) == 3
-
-
 class TestSystemEdgeCases:
     """Tests for edge cases and boundary conditions."""
 
@@ -493,7 +444,7 @@ class TestSystemEdgeCases:
         assert executor.is_plan_complete()
 
     @pytest.mark.asyncio
-    async def test_single_task_plan(self):
+    async def test_single_task_plan(self, async_return):
         """Test plan with only one task."""
         plan = {
             'plan_id': 'single',
@@ -509,14 +460,14 @@ class TestSystemEdgeCases:
         }
 
         executor = ParallelExecutor(plan)
-        executor.invoke_specialist = AsyncMock(return_value={
+        executor.invoke_specialist = async_return({
             'task_id': 'task-1',
             'specialist': 'backend-architect',
             'output': 'Done',
             'workspace_files': [],
             'kb_updates': []
         })
-        executor.run_checkpoint = AsyncMock()
+        executor.run_checkpoint = async_return(None)
 
         await executor.execute_plan()
 
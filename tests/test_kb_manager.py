@@ -0,0 +1,126 @@
+# tests/test_kb_manager.py
+"""Tests for knowledge base initialization and decision logging."""
+
+import json
+
+import pytest
+from utils.kb_manager import (
+    initialize_kb,
+    log_decision,
+    alog_decision,
+    flush_decision_log,
+)
+
+
+def test_kb_initialization_keeps_existing_files(tmp_path):
+    """Test that re-initializing fills in missing files without touching others."""
+    kb_dir = tmp_path / "nested" / "kb"
+    initialize_kb(kb_dir=kb_dir)
+    (kb_dir / "backend-patterns.md").write_text("custom patterns")
+    (kb_dir / "api-contracts.md").unlink()
+
+    initialize_kb(kb_dir=kb_dir)
+
+    assert (kb_dir / "backend-patterns.md").read_text() == "custom patterns"
+    assert (kb_dir / "api-contracts.md").read_text() == "# Api Contracts.Md\n\n"
+    assert json.loads((kb_dir / "dependencies.json").read_text()) == {}
+
+
+def test_decision_log_appends_across_kb_dirs(tmp_path):
+    """Test that entries land immediately, in order, in the KB they were logged to."""
+    first, second = tmp_path / "kb1", tmp_path / "kb2"
+    initialize_kb(kb_dir=first)
+    initialize_kb(kb_dir=second)
+
+    log_decision("backend-architect", "Use JWT", "Stateless", ["backend-api"], kb_dir=first)
+    log_decision("ui-ux", "Use tabs", "Familiar", ["frontend"], kb_dir=second)
+    log_decision("backend-architect", "Rotate keys", "Security", ["backend-api"], kb_dir=first)
+    flush_decision_log()
+
+    first_log = (first / "decisions.log").read_text()
+    assert first_log.index("Use JWT") < first_log.index("Rotate keys")
+    assert "Use tabs" not in first_log
+    assert "Use tabs" in (second / "decisions.log").read_text()
+
+
+def test_decision_log_reopened_after_delete(tmp_path, monkeypatch):
+    """Test that deleting or replacing decisions.log doesn't lose later entries."""
+    from utils import kb_manager
+
+    monkeypatch.setattr(kb_manager, "_LOG_RECHECK_SECONDS", 0)
+    kb_dir = tmp_path / "kb"
+    initialize_kb(kb_dir=kb_dir)
+    log_path = kb_dir / "decisions.log"
+
+    log_decision("backend-architect", "Use JWT", "Stateless", ["backend-api"], kb_dir=kb_dir)
+    log_path.unlink()
+    log_decision("backend-architect", "Rotate keys", "Security", ["backend-api"], kb_dir=kb_dir)
+
+    assert "Rotate keys" in log_path.read_text()
+
+    log_path.rename(kb_dir / "decisions.log.1")
+    initialize_kb(kb_dir=kb_dir)
+    log_decision("ui-ux", "Use tabs", "Familiar", ["frontend"], kb_dir=kb_dir)
+
+    assert "Use tabs" in log_path.read_text()
+    assert "Use tabs" not in (kb_dir / "decisions.log.1").read_text()
+
+
+def test_decision_log_completes_short_writes(tmp_path, monkeypatch):
+    """Test that an entry split across short os.write calls is written in full."""
+    import os
+    import types
+    from utils import kb_manager
+
+    kb_dir = tmp_path / "kb"
+    initialize_kb(kb_dir=kb_dir)
+    short_os = types.SimpleNamespace(**vars(os))
+    short_os.write = lambda fd, data: os.write(fd, bytes(data[:7]))
+    monkeypatch.setattr(kb_manager, "os", short_os)
+
+    log_decision("backend-architect", "Use JWT", "Stateless and scalable", ["backend-api"], kb_dir=kb_dir)
+
+    assert "Rationale: Stateless and scalable\nAffects: backend-api\n" in (kb_dir / "decisions.log").read_text()
+
+
+def test_decision_timestamp_cached_per_minute(monkeypatch):
+    """Test that the timestamp is reformatted only when the minute changes."""
+    from datetime import datetime
+    from utils import kb_manager
+
+    clock = [datetime(2025, 1, 2, 3, 4, 5).timestamp()]
+    monkeypatch.setattr(kb_manager.time, "time", lambda: clock[0])
+    monkeypatch.setattr(kb_manager, "_minute_stamp", (None, ""))
+
+    assert kb_manager._minute_timestamp() == "2025-01-02 03:04"
+    cached = kb_manager._minute_stamp
+
+    clock[0] += 30
+    assert kb_manager._minute_timestamp() == "2025-01-02 03:04"
+    assert kb_manager._minute_stamp is cached
+
+    clock[0] += 30
+    assert kb_manager._minute_timestamp() == "2025-01-02 03:05"
+
+
+@pytest.mark.asyncio
+async def test_async_decision_logging(tmp_path):
+    """Test logging decisions from async code via a worker thread."""
+    kb_dir = tmp_path / "kb"
+
+    initialize_kb(kb_dir=kb_dir)
+
+    await alog_decision(
+        specialist="fastapi-specialist",
+        decision="Version endpoints under /api/v1",
+        rationale="Allows breaking changes without disrupting clients",
+        affects=["backend-api"],
+        kb_dir=kb_dir,
+    )
+
+    log_content = (kb_dir / "decisions.log").read_text()
+    assert "Version endpoints under /api/v1" in log_content
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,13 +1,10 @@
 # tests/test_mvp_flow.py
 """Integration test for MVP coordinator flow."""
 
-import json
 import pytest
-from pathlib import Path
 from utils.dag_parser import parse_task_list, get_ready_tasks, update_task_status
 from utils.kb_manager import initialize_kb, verify_kb_exists, log_decision
 
-TEST_DIR = Path("test_codebase")
 
 def test_dag_parser():
     """Test parsing task list into plan JSON."""
@@ -47,10 +44,9 @@ def test_ready_tasks():
     assert set(ready) == {"task-2", "task-3"}
 
 
-def test_kb_initialization():
+def test_kb_initialization(tmp_path):
     """Test KB directory structure creation."""
-    kb_dir = TEST_DIR / "kb"
-    kb_dir.mkdir(parents=True, exist_ok=True)
+    kb_dir = tmp_path / "kb"
 
     initialize_kb(kb_dir=kb_dir)
 
@@ -60,10 +56,9 @@ def test_kb_initialization():
     assert (kb_dir / "dependencies.json").exists()
 
 
-def test_decision_logging():
+def test_decision_logging(tmp_path):
     """Test logging decisions to KB."""
-    kb_dir = TEST_DIR / "kb"
-    kb_dir.mkdir(parents=True, exist_ok=True)
+    kb_dir = tmp_path / "kb"
 
     initialize_kb(kb_dir=kb_dir)
 
@@ -82,6 +77,16 @@ def test_decision_logging():
     assert "Industry standard" in log_content
 
 
+def test_package_exports_resolve():
+    """Test that every lazily exported name in utils resolves."""
+    import utils
+
+    for name in utils.__all__:
+        assert getattr(utils, name) is not None
+
+    with pytest.raises(AttributeError):
+        utils.not_a_utility
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
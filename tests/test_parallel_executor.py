@@ -3,8 +3,9 @@
 
 import pytest
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
-from utils.parallel_executor import ParallelExecutor, execute_plan_parallel
+from utils.parallel_executor import ParallelExecutor, execute_plan_parallel, maybe_use_uvloop
 from utils.dag_parser import parse_task_list
 
 
@@ -92,6 +93,30 @@ class TestParallelExecutor:
 
         assert executor.max_parallel == 3
 
+    @pytest.mark.asyncio
+    async def test_caller_tasks_keep_their_type(self, simple_plan):
+        """Test that executing a plan leaves dict tasks as dicts, so it still serializes."""
+        executor = ParallelExecutor(simple_plan, invoker=AsyncMock(return_value={'output': 'Done'}))
+        executor.run_checkpoint = AsyncMock()
+
+        await executor.execute_plan()
+
+        assert all(type(task) is dict for task in simple_plan['tasks'].values())
+        assert json.loads(json.dumps(simple_plan))['tasks']['task-2']['title'] == 'Second task'
+
+    def test_scheduling_state_kept_off_the_plan(self):
+        """Test that the executor's dependency indexes live on the executor, not the plan."""
+        plan = parse_task_list([
+            "backend-architect: Design API",
+            "fastapi-specialist: Implement API (depends on: 1)"
+        ])
+
+        executor = ParallelExecutor(plan)
+
+        assert executor.dependents == {'task-1': ['task-2'], 'task-2': []}
+        assert executor.indegree == {'task-1': 0, 'task-2': 1}
+        assert set(plan) == {'plan_id', 'created_at', 'tasks'}
+
     @pytest.mark.asyncio
     async def test_execute_single_task(self, simple_plan):
         """Test executing a single task."""
@@ -199,6 +224,63 @@ class TestParallelExecutor:
         # Verify no more than 3 tasks ran concurrently
         assert max_concurrent <= 3
 
+    @pytest.mark.asyncio
+    async def test_direct_execution_is_bounded(self, parallel_ready_plan):
+        """Test that tasks executed directly still respect max_parallel."""
+        executor = ParallelExecutor(parallel_ready_plan)
+
+        max_concurrent = 0
+        current_concurrent = 0
+
+        async def mock_invoke(specialist, task_title, task_id):
+            nonlocal current_concurrent, max_concurrent
+            current_concurrent += 1
+            max_concurrent = max(max_concurrent, current_concurrent)
+            await asyncio.sleep(0.01)
+            current_concurrent -= 1
+            return {
+                'task_id': task_id,
+                'specialist': specialist,
+                'output': 'Done',
+                'workspace_files': [],
+                'kb_updates': []
+            }
+
+        executor.invoke_specialist = mock_invoke
+        executor.run_checkpoint = AsyncMock()
+
+        await asyncio.gather(*(
+            executor.execute_task(task_id) for task_id in parallel_ready_plan['tasks']
+        ))
+
+        assert max_concurrent == executor.max_parallel
+
+    @pytest.mark.asyncio
+    async def test_bound_follows_max_parallel_set_after_construction(self, parallel_ready_plan):
+        """Test that changing max_parallel after construction changes the invocation bound."""
+        executor = ParallelExecutor(parallel_ready_plan)
+        executor.max_parallel = 2
+
+        max_concurrent = 0
+        current_concurrent = 0
+
+        async def invoker(specialist, task_title, task_id):
+            nonlocal current_concurrent, max_concurrent
+            current_concurrent += 1
+            max_concurrent = max(max_concurrent, current_concurrent)
+            await asyncio.sleep(0.01)
+            current_concurrent -= 1
+            return {'output': 'Done'}
+
+        executor.invoker = invoker
+        executor.run_checkpoint = AsyncMock()
+
+        await asyncio.gather(*(
+            executor.execute_task(task_id) for task_id in parallel_ready_plan['tasks']
+        ))
+
+        assert max_concurrent == 2
+
     @pytest.mark.asyncio
     async def test_dependency_resolution(self, simple_plan):
         """Test that tasks respect dependency order."""
@@ -233,6 +315,83 @@ class TestParallelExecutor:
         assert task1_idx < task2_idx
         assert task2_idx < task3_idx
 
+    @pytest.mark.asyncio
+    async def test_critical_path_dispatched_first(self):
+        """Test that the ready task with the longest downstream chain starts first."""
+        plan = {
+            'plan_id': 'priority-test',
+            'tasks': {
+                'task-1': {
+                    'id': 'task-1',
+                    'title': 'Leaf task',
+                    'specialist': 'ui-ux',
+                    'status': 'pending',
+                    'dependencies': []
+                },
+                'task-2': {
+                    'id': 'task-2',
+                    'title': 'Chain root',
+                    'specialist': 'backend-architect',
+                    'status': 'pending',
+                    'dependencies': []
+                },
+                'task-3': {
+                    'id': 'task-3',
+                    'title': 'Chain tail',
+                    'specialist': 'fastapi-specialist',
+                    'status': 'pending',
+                    'dependencies': ['task-2']
+                }
+            }
+        }
+        executor = ParallelExecutor(plan)
+        executor.max_parallel = 1
+
+        execution_order = []
+
+        async def mock_invoke(specialist, task_title, task_id):
+            execution_order.append(task_id)
+            return {
+                'task_id': task_id,
+                'specialist': specialist,
+                'output': 'Done',
+                'workspace_files': [],
+                'kb_updates': []
+            }
+
+        executor.invoke_specialist = mock_invoke
+        executor.run_checkpoint = AsyncMock()
+
+        await executor.execute_plan()
+
+        assert execution_order[0] == 'task-2'
+        assert all(t['status'] == 'completed' for t in plan['tasks'].values())
+
+    @pytest.mark.asyncio
+    async def test_shallow_tasks_dispatched_first_on_ties(self, async_return):
+        """Test that equal critical-path ties go to the task nearest the roots."""
+        plan = parse_task_list([
+            "backend-architect: Design API",
+            "fastapi-specialist: Implement API (depends on: 1)",
+            "ui-ux: Design UI"
+        ])
+        plan['tasks']['task-1']['status'] = 'completed'
+        executor = ParallelExecutor(plan)
+        executor.max_parallel = 1
+
+        execution_order = []
+
+        async def mock_invoke(specialist, task_title, task_id):
+            execution_order.append(task_id)
+            return {'task_id': task_id, 'workspace_files': [], 'kb_updates': []}
+
+        executor.invoke_specialist = mock_invoke
+        executor.run_checkpoint = async_return(None)
+
+        await executor.execute_plan()
+
+        assert execution_order == ['task-3', 'task-2']
+
     @pytest.mark.asyncio
     async def test_is_plan_complete(self, simple_plan):
         """Test plan completion detection."""
@@ -310,6 +469,63 @@ class TestParallelExecutor:
         # Running tasks should be cleaned up after execution
         assert len(executor.running_tasks) == 0
 
+    @pytest.mark.asyncio
+    async def test_checkpoints_flushed_in_batches(self, parallel_ready_plan, tmp_path, monkeypatch):
+        """Test that checkpoint records are persisted once per scheduler wake-up."""
+        import utils.parallel_executor as parallel_executor
+
+        checkpoint_path = tmp_path / 'checkpoints.jsonl'
+        executor = ParallelExecutor(parallel_ready_plan, checkpoint_path=checkpoint_path)
+
+        async def mock_invoke(specialist, task_title, task_id):
+            return {'task_id': task_id, 'workspace_files': [], 'kb_updates': []}
+
+        flushes = []
+        real_flush = parallel_executor._flush_checkpoints
+
+        def counting_flush(path, records):
+            flushes.append(len(records))
+            real_flush(path, records)
+
+        monkeypatch.setattr(parallel_executor, '_flush_checkpoints', counting_flush)
+        executor.invoke_specialist = mock_invoke
+
+        await executor.execute_plan()
+
+        lines = checkpoint_path.read_text().splitlines()
+        assert sorted(json.loads(line)['task_id'] for line in lines) == \
+            sorted(parallel_ready_plan['tasks'])
+        assert sum(flushes) == len(lines)
+        assert len(flushes) < len(lines)
+
+    @pytest.mark.asyncio
+    async def test_failed_checkpoint_flush_keeps_records_and_raises(self, simple_plan, tmp_path):
+        """Test that records that can't be written stay buffered and the failure surfaces."""
+        checkpoint_path = tmp_path / 'checkpoints.jsonl'
+
+        async def invoker(specialist, task_title, task_id):
+            return {'task_id': task_id, 'output': {'not', 'json'} if task_id == 'task-1' else 'Done'}
+
+        executor = ParallelExecutor(simple_plan, checkpoint_path=checkpoint_path, invoker=invoker)
+
+        with pytest.raises(TypeError):
+            await executor.execute_plan()
+
+        assert [record['task_id'] for record in executor._checkpoint_buffer][0] == 'task-1'
+        assert not checkpoint_path.exists() or 'task-1' not in checkpoint_path.read_text()
+
+    def test_checkpoint_encoding_without_orjson(self, monkeypatch):
+        """Test that checkpoint records encode the same with the stdlib fallback."""
+        import utils.parallel_executor as parallel_executor
+
+        record = {'task_id': 'task-1', 'result': {'kb_updates': []}, 'ts': 'now'}
+        monkeypatch.setattr(parallel_executor, 'orjson', None)
+
+        line = parallel_executor._encode_checkpoint(record)
+
+        assert line.endswith(b'\n')
+        assert json.loads(line) == record
+
 
 class TestExecutePlanParallel:
     """Tests for execute_plan_parallel function."""
@@ -339,12 +555,72 @@ class TestExecutePlanParallel:
             result = await execute_plan_parallel(plan)
 
             # Verify executor was created and executed
-            MockExecutor.assert_called_once_with(plan)
+            MockExecutor.assert_called_once_with(plan, invoker=None)
             mock_instance.execute_plan.assert_called_once()
 
             # Verify plan was returned
             assert result == plan
 
+    @pytest.mark.asyncio
+    async def test_execute_plan_parallel_uses_injected_invoker(self):
+        """Test that an injected invoker replaces the placeholder transport."""
+        plan = parse_task_list([
+            "backend-architect: Design API",
+            "fastapi-specialist: Implement API (depends on: 1)"
+        ])
+        calls = []
+
+        async def invoker(specialist, task_title, task_id):
+            calls.append((specialist, task_title, task_id))
+            return {'task_id': task_id, 'output': 'Done'}
+
+        result = await execute_plan_parallel(plan, invoker=invoker)
+
+        assert calls == [
+            ('backend-architect', 'Design API', 'task-1'),
+            ('fastapi-specialist', 'Implement API', 'task-2')
+        ]
+        assert all(task['status'] == 'completed' for task in result['tasks'].values())
+
+    @pytest.mark.asyncio
+    async def test_dependents_dispatched_without_delay(self):
+        """Test that a long chain runs back to back, with no per-dispatch sleep."""
+        plan = parse_task_list(
+            ["backend-architect: Step 1"] +
+            [f"backend-architect: Step {i} (depends on: {i - 1})" for i in range(2, 51)]
+        )
+
+        async def invoker(specialist, task_title, task_id):
+            return {'task_id': task_id, 'output': 'Done'}
+
+        result = await asyncio.wait_for(execute_plan_parallel(plan, invoker=invoker), timeout=1)
+
+        assert all(task['status'] == 'completed' for task in result['tasks'].values())
+
+
+class TestEventLoopSelection:
+    """Tests for optional uvloop selection."""
+
+    def test_uvloop_disabled_by_default(self, monkeypatch):
+        """Test that uvloop is only installed when explicitly requested."""
+        monkeypatch.delenv('COORDINATOR_UVLOOP', raising=False)
+
+        assert maybe_use_uvloop() is False
+
+    def test_uvloop_installed_when_requested(self, monkeypatch):
+        """Test that the entry-point helper installs uvloop's policy on request."""
+        import sys
+        import types
+
+        policies = []
+        fake_uvloop = types.SimpleNamespace(EventLoopPolicy=lambda: 'uvloop-policy')
+        monkeypatch.setitem(sys.modules, 'uvloop', fake_uvloop)
+        monkeypatch.setattr(asyncio, 'set_event_loop_policy', policies.append)
+        monkeypatch.setenv('COORDINATOR_UVLOOP', '1')
+
+        assert maybe_use_uvloop() is True
+        assert policies == ['uvloop-policy']
+
 
 class TestDAGExecution:
     """Integration tests for DAG-based execution."""
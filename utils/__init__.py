@@ -1,13 +1,50 @@
 # utils/__init__.py
 """Utility modules for multi-agent dev team coordinator."""
 
-from .auto_planner import auto_plan_feature, analyze_domains
-from .specialist_consultation import consult_specialist, consult_all_relevant_specialists
-from .checkpoint_validator import CheckpointValidator, run_checkpoint
-from .dag_parser import parse_task_list, get_ready_tasks, update_task_status, detect_cycles, CircularDependencyError
-from .error_recovery import ErrorRecovery, FailureType, handle_task_failure
-from .kb_manager import initialize_kb, verify_kb_exists, log_decision
-from .parallel_executor import ParallelExecutor, execute_plan_parallel
+import importlib
+
+# Public name -> submodule defining it. Submodules are imported on first
+# access (PEP 562), so importing one utility doesn't load all of them.
+_LAZY = {
+    'auto_plan_feature': 'auto_planner',
+    'analyze_domains': 'auto_planner',
+    'consult_specialist': 'specialist_consultation',
+    'consult_all_relevant_specialists': 'specialist_consultation',
+    'CheckpointValidator': 'checkpoint_validator',
+    'run_checkpoint': 'checkpoint_validator',
+    'parse_task_list': 'dag_parser',
+    'get_ready_tasks': 'dag_parser',
+    'update_task_status': 'dag_parser',
+    'detect_cycles': 'dag_parser',
+    'build_dependents_index': 'dag_parser',
+    'compute_indegrees': 'dag_parser',
+    'CircularDependencyError': 'dag_parser',
+    'ErrorRecovery': 'error_recovery',
+    'FailureType': 'error_recovery',
+    'handle_task_failure': 'error_recovery',
+    'initialize_kb': 'kb_manager',
+    'verify_kb_exists': 'kb_manager',
+    'log_decision': 'kb_manager',
+    'alog_decision': 'kb_manager',
+    'flush_decision_log': 'kb_manager',
+    'ParallelExecutor': 'parallel_executor',
+    'execute_plan_parallel': 'parallel_executor',
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     'auto_plan_feature',
@@ -20,6 +57,8 @@ __all__ = [
     'get_ready_tasks',
     'update_task_status',
     'detect_cycles',
+    'build_dependents_index',
+    'compute_indegrees',
     'CircularDependencyError',
     'ErrorRecovery',
     'FailureType',
@@ -27,6 +66,8 @@ __all__ = [
     'initialize_kb',
     'verify_kb_exists',
     'log_decision',
+    'alog_decision',
+    'flush_decision_log',
     'ParallelExecutor',
     'execute_plan_parallel',
 ]
@@ -1,11 +1,39 @@
 # utils/auto_planner.py
 """Auto-planning module for coordinator."""
 
-from typing import Dict, List, Optional
+import asyncio
+import copy
+import functools
+import hashlib
+import os
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from .specialist_consultation import consult_all_relevant_specialists
 
+# Keyword-based domain detection, in the order domains are reported
+_DOMAIN_KEYWORDS = {
+    'backend': ['api', 'endpoint', 'database', 'backend', 'server', 'agent', 'tool'],
+    'frontend': ['ui', 'component', 'frontend', 'client', 'interface'],
+    'backend-deployment': ['container', 'docker', 'deploy'],
+    'frontend-chat': ['chat', 'message', 'conversation'],
+    'frontend-3d': ['3d', 'matterport', 'viewer', 'mattertag'],
+}
+
+# One alternation with a named group per domain, wrapped in a lookahead so
+# every keyword occurrence is reported, including overlapping ones (keeps
+# the plain substring semantics). Runs as a single C-level scan per call.
+_DOMAIN_GROUPS = {f'd{i}': domain for i, domain in enumerate(_DOMAIN_KEYWORDS)}
+_DOMAIN_RE = re.compile(
+    '(?=' + '|'.join(
+        f'(?P<{group}>' + '|'.join(map(re.escape, _DOMAIN_KEYWORDS[domain])) + ')'
+        for group, domain in _DOMAIN_GROUPS.items()
+    ) + ')',
+    re.IGNORECASE
+)
+
 
 async def auto_plan_feature(
     feature_description: str,
@@ -24,8 +52,18 @@ async def auto_plan_feature(
     # Step 1: Analyze feature to determine domains affected
     domains = analyze_domains(feature_description, user_hints or {})
 
-    # Step 2: Load KB state
-    kb_state = load_kb_state()
+    # Step 2: Load KB state (keyed by the KB files it was read from)
+    kb_key = _kb_state_key()
+    kb_state = await aload_kb_state()
+
+    # Reuse the plan from an earlier call with the same feature, domains
+    # and KB files, skipping the specialist consultations
+    cache_key = (plan_digest(feature_description), tuple(domains), kb_key)
+    cached = _plan_cache.get(cache_key)
+    if cached is not None:
+        plan = copy.deepcopy(cached)
+        plan['created_at'] = datetime.now().isoformat()
+        return plan
 
     # Step 3: Consult specialists
     specialist_responses = await consult_all_relevant_specialists(
@@ -41,40 +79,33 @@ async def auto_plan_feature(
         domains
     )
 
+    if len(_plan_cache) >= _PLAN_CACHE_SIZE:
+        _plan_cache.pop(next(iter(_plan_cache)))  # evict the oldest plan
+    _plan_cache[cache_key] = copy.deepcopy(plan)
     return plan
 
 
-def analyze_domains(feature_description: str, user_hints: Optional[Dict] = None) -> List[str]:
+def plan_digest(feature_description: str) -> str:
+    """Return a stable content hash of a feature description (for plan IDs)."""
+    return hashlib.blake2b(feature_description.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def analyze_domains(
+    feature_description: str,
+    user_hints: Optional[Mapping[str, Any]] = None
+) -> List[str]:
     """
     Analyze feature description to determine affected domains.
 
-    Uses keyword matching and user hints.
+    Uses keyword matching (one precompiled regex scan over the
+    description) and user hints. Hinted domains are returned as a copy,
+    so callers can't mutate the hints they came from.
     """
     hints = user_hints or {}
-    if hints and 'domains' in hints:
-        return hints['domains']
-
-    domains = []
-
-    # Keyword-based domain detection
-    backend_keywords = ['api', 'endpoint', 'database', 'backend', 'server', 'agent', 'tool']
-    frontend_keywords = ['ui', 'component', 'frontend', 'client', 'interface']
-    docker_keywords = ['container', 'docker', 'deploy']
-    chat_keywords = ['chat', 'message', 'conversation']
-    matterport_keywords = ['3d', 'matterport', 'viewer', 'mattertag']
-
-    desc_lower = feature_description.lower()
-
-    if any(kw in desc_lower for kw in backend_keywords):
-        domains.append('backend')
-    if any(kw in desc_lower for kw in frontend_keywords):
-        domains.append('frontend')
-    if any(kw in desc_lower for kw in docker_keywords):
-        domains.append('backend-deployment')
-    if any(kw in desc_lower for kw in chat_keywords):
-        domains.append('frontend-chat')
-    if any(kw in desc_lower for kw in matterport_keywords):
-        domains.append('frontend-3d')
+    if 'domains' in hints:
+        return list(hints['domains'])
+
+    domains = list(_match_domains(feature_description))
 
     # Default to both if unclear
     if not domains:
@@ -83,37 +114,176 @@ def analyze_domains(feature_description: str, user_hints: Optional[Dict] = None)
     return domains
 
 
+@functools.lru_cache(maxsize=256)
+def _match_domains(feature_description: str) -> Tuple[str, ...]:
+    """Return keyword-matched domains for a description, in canonical order."""
+    matched = set()
+    for match in _DOMAIN_RE.finditer(feature_description):
+        matched.add(_DOMAIN_GROUPS[match.lastgroup])
+        if len(matched) == len(_DOMAIN_KEYWORDS):
+            break  # every domain found; skip the rest of the description
+    return tuple(domain for domain in _DOMAIN_KEYWORDS if domain in matched)
+
+
+# Specialists in typical workflow order; synthesized tasks follow this order
+_WORKFLOW_ORDER = (
+    'code-reviewer',  # Pre-planning cleanup
+    'backend-architect',
+    'backend-design',
+    'openai-agents-sdk',
+    'fastapi-specialist',
+    'docker-specialist',
+    'ui-ux',
+    'javascript-specialist',
+    'matterport-sdk',
+    'chat-specialist',
+    'code-quality-frontend'
+)
+_WORKFLOW_SPECIALISTS = frozenset(_WORKFLOW_ORDER)
+
+# Placeholder task titles per specialist
+_TASK_TITLES = MappingProxyType({
+    'code-reviewer': 'Pre-planning cleanup: remove dead code',
+    'backend-architect': 'Design architecture',
+    'backend-design': 'Design API schemas',
+    'fastapi-specialist': 'Implement endpoints',
+    'openai-agents-sdk': 'Create agents and tools',
+    'docker-specialist': 'Update container config',
+    'ui-ux': 'Design and implement UI',
+    'javascript-specialist': 'Implement JavaScript logic',
+    'matterport-sdk': 'Integrate Matterport SDK',
+    'chat-specialist': 'Implement chat features',
+    'code-quality-frontend': 'Review and optimize frontend'
+})
+
+# Plans from auto_plan_feature, keyed by (feature digest, domains, KB file key)
+_plan_cache: Dict[tuple, Dict] = {}
+_PLAN_CACHE_SIZE = 64
+
+# KB pattern files loaded into planning context
+_PATTERN_FILES = (
+    'backend-patterns.md',
+    'frontend-patterns.md',
+    'api-contracts.md',
+    'openai-agents.md',
+    'matterport-integration.md',
+    'docker-patterns.md'
+)
+
+# Last loaded KB state, keyed by (path, mtime_ns, size) of every KB file read
+_kb_cache: Optional[Tuple[tuple, Dict]] = None
+
+
 def load_kb_state() -> Dict:
-    """Load current KB state (patterns, recent decisions)."""
-    kb_dir = Path('kb')
+    """
+    Load current KB state (patterns, recent decisions).
+
+    The files are only re-read when one of them changes (by mtime/size)
+    or appears/disappears; otherwise the cached contents are returned.
+    """
+    global _kb_cache
+    key = _kb_state_key()
+    if _kb_cache is None or _kb_cache[0] != key:
+        _kb_cache = (key, _read_kb_state([part[0] for part in key]))
+    return _copy_kb_state(_kb_cache[1])
+
+
+async def aload_kb_state() -> Dict:
+    """
+    Async variant of load_kb_state for use inside the event loop.
+
+    Shares its cache; re-reads happen concurrently in worker threads.
+    """
+    global _kb_cache
+    key = _kb_state_key()
+    if _kb_cache is None or _kb_cache[0] != key:
+        _kb_cache = (key, await _aread_kb_state([part[0] for part in key]))
+    return _copy_kb_state(_kb_cache[1])
+
+
+def _kb_state_key() -> tuple:
+    """Return (path, mtime_ns, size) for every KB file that currently exists."""
+    kb_dir = Path('kb').absolute()
+    paths = [kb_dir / name for name in _PATTERN_FILES]
+    paths.append(kb_dir / 'decisions.log')
+
+    key_parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        key_parts.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(key_parts)
+
+
+def _copy_kb_state(state: Dict) -> Dict:
+    """Copy cached KB state so callers can't mutate the cache."""
+    return {
+        'patterns': dict(state['patterns']),
+        'recent_decisions': list(state['recent_decisions'])
+    }
+
+
+def _read_kb_state(existing_paths: List[Path]) -> Dict:
+    """Read pattern files and the decisions log tail from the given paths."""
+    return _assemble_kb_state(existing_paths, [_read_kb_file(path) for path in existing_paths])
+
+
+async def _aread_kb_state(existing_paths: List[Path]) -> Dict:
+    """Read the given KB files concurrently in worker threads."""
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(_read_kb_file, path) for path in existing_paths)
+    )
+    return _assemble_kb_state(existing_paths, contents)
+
+
+def _assemble_kb_state(existing_paths: List[Path], contents: List) -> Dict:
+    """Group file contents into patterns (by file name) and recent decisions."""
     state = {
         'patterns': {},
         'recent_decisions': []
     }
 
-    # Load pattern files
-    pattern_files = [
-        'backend-patterns.md',
-        'frontend-patterns.md',
-        'api-contracts.md',
-        'openai-agents.md',
-        'matterport-integration.md',
-        'docker-patterns.md'
-    ]
+    for path, content in zip(existing_paths, contents):
+        if path.name == 'decisions.log':
+            state['recent_decisions'] = content
+        else:
+            state['patterns'][path.name] = content
 
-    for pattern_file in pattern_files:
-        path = kb_dir / pattern_file
-        if path.exists():
-            state['patterns'][pattern_file] = path.read_text()
+    return state
 
-    # Load recent decisions (last 10)
-    decisions_path = kb_dir / 'decisions.log'
-    if decisions_path.exists():
-        lines = decisions_path.read_text().split('\n')
-        # Parse last 10 decision entries
-        state['recent_decisions'] = lines[-50:]  # ~10 decisions (5 lines each)
 
-    return state
+def _read_kb_file(path: Path):
+    """Read one KB file: a pattern file's text, or the decisions log tail."""
+    if path.name == 'decisions.log':
+        # Load recent decisions (last 10)
+        return _tail_lines(path, 50)  # ~10 decisions (5 lines each)
+    return path.read_text()
+
+
+def _tail_lines(path: Path, n_lines: int = 50, chunk: int = 8192) -> List[str]:
+    """
+    Return the last n_lines of a file, same as read_text().split('\\n')[-n_lines:].
+
+    Reads backwards from the end in chunks until enough newlines are seen,
+    so the cost depends on the tail size rather than the file size.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        # n_lines trailing pieces need n_lines - 1 separators, plus one more
+        # to know the earliest piece is complete
+        while pos > 0 and data.count(b'\n') < n_lines:
+            step = min(chunk, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    if pos > 0:
+        # Drop the partial first line (it may also split a multi-byte char)
+        data = data[data.index(b'\n') + 1:]
+    return data.decode().split('\n')[-n_lines:]
 
 
 def synthesize_plan(
@@ -130,57 +300,31 @@ def synthesize_plan(
     - Scope boundaries
     - Success criteria
     """
-    tasks = []
-    task_id = 1
-
-    # Order specialists by typical workflow
-    workflow_order = [
-        'code-reviewer',  # Pre-planning cleanup
-        'backend-architect',
-        'backend-design',
-        'openai-agents-sdk',
-        'fastapi-specialist',
-        'docker-specialist',
-        'ui-ux',
-        'javascript-specialist',
-        'matterport-sdk',
-        'chat-specialist',
-        'code-quality-frontend'
-    ]
-
-    previous_task_id = None
-
-    for specialist in workflow_order:
-        if specialist not in specialist_responses:
-            continue
-
-        _response = specialist_responses[specialist]
-
-        # Extract task from specialist response
-        # (In real implementation, parse response to extract task details)
-        task_title = extract_task_title(specialist, _response)
-
-        task = {
-            'id': f'task-{task_id}',
-            'title': task_title,
+    # Extract each task from its specialist's response
+    # (In real implementation, parse response to extract task details)
+    skeleton = _plan_skeleton(_WORKFLOW_SPECIALISTS.intersection(specialist_responses))
+    tasks = {
+        tid: {
+            'id': tid,
+            'title': extract_task_title(specialist, specialist_responses[specialist]),
             'specialist': specialist,
             'status': 'pending',
-            'dependencies': [previous_task_id] if previous_task_id else []
+            'dependencies': list(dependencies)
         }
+        for tid, specialist, dependencies in skeleton
+    }
 
-        tasks.append(task)
-        previous_task_id = f'task-{task_id}'
-        task_id += 1
+    what_to_change, what_not_to_change = extract_scopes(specialist_responses)
 
     plan = {
-        'plan_id': f'auto-plan-{hash(feature_description) % 10000}',
+        'plan_id': f'auto-plan-{plan_digest(feature_description)}',
         'created_at': datetime.now().isoformat(),
         'feature_description': feature_description,
         'domains_affected': domains,
-        'tasks': {task['id']: task for task in tasks},
+        'tasks': tasks,
         'scope_boundaries': {
-            'what_to_change': extract_scope_from_responses(specialist_responses, 'change'),
-            'what_not_to_change': extract_scope_from_responses(specialist_responses, 'preserve')
+            'what_to_change': what_to_change,
+            'what_not_to_change': what_not_to_change
         },
         'success_criteria': [
             'All tasks completed successfully',
@@ -192,28 +336,62 @@ def synthesize_plan(
     return plan
 
 
+@functools.lru_cache(maxsize=256)
+def _plan_skeleton(specialists: frozenset) -> Tuple[Tuple[str, str, Tuple[str, ...]], ...]:
+    """
+    Return (task_id, specialist, dependencies) rows for a set of responding
+    specialists: one task each, in workflow order, chained one after another.
+
+    Plans are usually drawn from a handful of specialist combinations, so
+    the layout is computed once per combination.
+    """
+    rows = []
+    previous_task_id = None
+    for specialist in _WORKFLOW_ORDER:
+        if specialist not in specialists:
+            continue
+        tid = f'task-{len(rows) + 1}'
+        rows.append((tid, specialist, (previous_task_id,) if previous_task_id else ()))
+        previous_task_id = tid
+    return tuple(rows)
+
+
 def extract_task_title(specialist: str, _response: str) -> str:
     """Extract task title from specialist response."""
     # Placeholder - in real implementation, parse response
-    titles = {
-        'code-reviewer': 'Pre-planning cleanup: remove dead code',
-        'backend-architect': 'Design architecture',
-        'backend-design': 'Design API schemas',
-        'fastapi-specialist': 'Implement endpoints',
-        'openai-agents-sdk': 'Create agents and tools',
-        'docker-specialist': 'Update container config',
-        'ui-ux': 'Design and implement UI',
-        'javascript-specialist': 'Implement JavaScript logic',
-        'matterport-sdk': 'Integrate Matterport SDK',
-        'chat-specialist': 'Implement chat features',
-        'code-quality-frontend': 'Review and optimize frontend'
-    }
-    return titles.get(specialist, f'{specialist} task')
+    return _TASK_TITLES.get(specialist, f'{specialist} task')
+
+
+def extract_scope_from_responses(responses: Dict[str, str], scope_type: str) -> List[str]:
+    """Extract scope boundaries of one type ('change' or 'preserve') from responses."""
+    what_to_change, what_not_to_change = extract_scopes(responses)
+    return what_to_change if scope_type == 'change' else what_not_to_change
+
+
+def extract_scopes(responses: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """
+    Extract (what_to_change, what_not_to_change) from specialist responses.
+
+    Collects lines marked "CHANGE:" or "PRESERVE:" in a single pass over
+    each response. A scope type with no marked lines falls back to a
+    generic placeholder entry.
+    """
+    buckets = {'CHANGE:': [], 'PRESERVE:': []}
+    for response in responses.values():
+        for line in response.splitlines():
+            for marker, bucket in buckets.items():
+                if marker in line:
+                    bucket.append(line.split(marker, 1)[1].strip())
+                    break
+
+    return (
+        buckets['CHANGE:'] or _placeholder_scope('change'),
+        buckets['PRESERVE:'] or _placeholder_scope('preserve')
+    )
 
 
-def extract_scope_from_responses(_responses: Dict[str, str], scope_type: str) -> List[str]:
-    """Extract scope boundaries from specialist responses."""
-    # Placeholder - in real implementation, parse responses for scope mentions
+def _placeholder_scope(scope_type: str) -> List[str]:
+    """Generic scope entry used when responses carry no scope markers."""
     return [
         f'Items to {scope_type} based on specialist input',
         '(Extracted from consultation responses)'
@@ -1,8 +1,135 @@
 # utils/checkpoint_validator.py
 """Advanced checkpoint validation with peer review."""
 
-from typing import Dict, List
+import asyncio
+import contextvars
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
+from .dag_parser import DONE_STATUSES, update_task_status
+
+logger = logging.getLogger(__name__)
+
+# Task being checkpointed in the current context; stamped on log records
+# as `task_id` so interleaved output from concurrent checkpoints can be told apart
+current_task_id: contextvars.ContextVar[str] = contextvars.ContextVar(
+    'checkpoint_task_id', default='-'
+)
+
+
+class _TaskIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.task_id = current_task_id.get()
+        return True
+
+
+logger.addFilter(_TaskIdFilter())
+
+
+# Background listener installed by configure_checkpoint_logging
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_checkpoint_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Send checkpoint logs to stdout from a background thread.
+
+    Workers only enqueue records (QueueHandler); a QueueListener formats and
+    writes them as "[task_id] message", so concurrent checkpoints never
+    contend on stdout. Safe to call repeatedly: later calls only update the
+    level. Returns the started listener; call stop() on it to flush.
+    """
+    global _log_listener
+    logger.setLevel(level)
+    if _log_listener is not None:
+        return _log_listener
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter('[%(task_id)s] %(message)s'))
+    _log_listener = logging.handlers.QueueListener(log_queue, stream)
+    _log_listener.start()
+    return _log_listener
+
+
+# Max concurrent reviewer invocations across all validators
+REVIEWER_CONCURRENCY = int(os.environ.get('REVIEWER_CONCURRENCY', '4'))
+
+# Specialist-name fragments that route review to the frontend quality reviewer
+_FRONTEND_MARKERS = ('frontend', 'ui', 'javascript')
+
+# Extra reviewers for cross-domain impact
+_CROSS_DOMAIN_REVIEWERS = {
+    'fastapi-specialist': ('backend-architect',),  # Architect reviews implementation
+    'openai-agents-sdk': ('backend-architect',),
+    'ui-ux': ('code-quality-frontend',),
+    'javascript-specialist': ('code-quality-frontend',)
+}
+
+_reviewer_sem: Optional[asyncio.Semaphore] = None
+_reviewer_sem_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _reviewer_semaphore() -> asyncio.Semaphore:
+    """Return the shared reviewer semaphore, created for the running loop."""
+    global _reviewer_sem, _reviewer_sem_loop
+    loop = asyncio.get_running_loop()
+    if _reviewer_sem is None or _reviewer_sem_loop is not loop:
+        _reviewer_sem = asyncio.Semaphore(REVIEWER_CONCURRENCY)
+        _reviewer_sem_loop = loop
+    return _reviewer_sem
+
+
+@functools.lru_cache(maxsize=64)
+def _reviewers_for(specialist: str) -> Tuple[str, ...]:
+    """
+    Return the reviewers for a specialist's tasks, code-quality reviewer first.
+
+    Cached per specialist, so retried checkpoints don't recompute it.
+    """
+    reviewers = []
+
+    # Always review by code reviewer
+    if specialist not in ('code-reviewer', 'code-quality-frontend'):
+        if any(marker in specialist for marker in _FRONTEND_MARKERS):
+            reviewers.append('code-quality-frontend')
+        else:
+            reviewers.append('code-reviewer')
+
+    # Cross-domain review
+    reviewers.extend(_CROSS_DOMAIN_REVIEWERS.get(specialist, ()))
+    return tuple(reviewers)
+
+
+def _missing_files(paths: List[str]) -> List[str]:
+    """
+    Return the paths that don't exist (as Path.exists() would say), in
+    input order.
+
+    Lists each parent directory once with os.scandir instead of stat-ing
+    every path separately; any entry, file or directory, counts as present.
+    """
+    listings: Dict[Path, Set[str]] = {}
+    missing = []
+    for path_str in paths:
+        path = Path(path_str)
+        names = listings.get(path.parent)
+        if names is None:
+            try:
+                with os.scandir(path.parent) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
+            listings[path.parent] = names
+        if path.name not in names:
+            missing.append(path_str)
+    return missing
 
 
 class CheckpointValidator:
@@ -19,26 +146,34 @@ class CheckpointValidator:
 
         Returns True if validation passed, False otherwise.
         """
-        print(f"\n=== Checkpoint: {self.task_id} ===")
+        token = current_task_id.set(self.task_id)
+        try:
+            return await self._run_steps()
+        finally:
+            current_task_id.reset(token)
+
+    async def _run_steps(self) -> bool:
+        """Run the four checkpoint steps, stopping at the first failure."""
+        logger.info("=== Checkpoint: %s ===", self.task_id)
 
         # Step 1: Automatic validation
         if not await self.automatic_validation():
-            print("❌ Automatic validation failed")
+            logger.warning("❌ Automatic validation failed")
             return False
 
         # Step 2: Peer review
         if not await self.peer_review():
-            print("❌ Peer review failed")
+            logger.warning("❌ Peer review failed")
             return False
 
         # Step 3: KB sync
         if not await self.kb_sync():
-            print("❌ KB sync failed")
+            logger.warning("❌ KB sync failed")
             return False
 
         # Step 4: Final approval
         self.final_approval()
-        print("✅ Checkpoint passed\n")
+        logger.info("✅ Checkpoint passed")
         return True
 
     async def automatic_validation(self) -> bool:
@@ -50,18 +185,18 @@ class CheckpointValidator:
         - Pattern compliance
         - No obvious errors
         """
-        print("  [1/4] Running automatic validation...")
+        logger.info("  [1/4] Running automatic validation...")
 
         # Check workspace files
         workspace_file = self.task.get('output_workspace')
         if workspace_file and not Path(workspace_file).exists():
-            print(f"    ⚠ Workspace file missing: {workspace_file}")
+            logger.warning("    ⚠ Workspace file missing: %s", workspace_file)
             return False
 
         # Check KB updates if expected
         # (Pattern compliance check would go here)
 
-        print("    ✓ Automatic validation passed")
+        logger.info("    ✓ Automatic validation passed")
         return True
 
     async def peer_review(self) -> bool:
@@ -73,47 +208,63 @@ class CheckpointValidator:
         - Domain specialists (if cross-domain impact)
         - Architecture specialist (for design tasks)
         """
-        print("  [2/4] Running peer review...")
+        logger.info("  [2/4] Running peer review...")
 
         reviewers = self.get_peer_reviewers()
-
         for reviewer in reviewers:
-            print(f"    Consulting {reviewer}...")
-            review_result = await self.invoke_reviewer(reviewer)
+            logger.info("    Consulting %s...", reviewer)
+
+        if reviewers:
+            # The code-quality reviewer is the usual veto: domain reviewers
+            # start speculatively alongside it and are cancelled if it rejects
+            primary, *extras = reviewers
+            extra_reviews = [
+                asyncio.create_task(self._bounded_review(reviewer)) for reviewer in extras
+            ]
+            try:
+                try:
+                    primary_result = await self._bounded_review(primary)
+                except Exception as e:
+                    primary_result = e
+
+                if not self._report_review(primary, primary_result):
+                    return False
+
+                extra_results = await asyncio.gather(*extra_reviews, return_exceptions=True)
+            finally:
+                # On rejection or cancellation, don't leave reviews running
+                for review in extra_reviews:
+                    review.cancel()
+                await asyncio.gather(*extra_reviews, return_exceptions=True)
+
+            for reviewer, review_result in zip(extras, extra_results):
+                if not self._report_review(reviewer, review_result):
+                    return False
+
+        logger.info("    ✓ Peer review passed")
+        return True
 
-            if not review_result['approved']:
-                print(f"    ❌ {reviewer} flagged issues:")
-                for issue in review_result['issues']:
-                    print(f"      - {issue}")
-                return False
+    @staticmethod
+    def _report_review(reviewer: str, review_result) -> bool:
+        """Log a rejected review's issues; return whether it approved."""
+        if isinstance(review_result, BaseException):
+            review_result = {'approved': False, 'issues': [f'Review failed: {review_result}']}
 
-        print("    ✓ Peer review passed")
+        if not review_result['approved']:
+            logger.warning("    ❌ %s flagged issues:", reviewer)
+            for issue in review_result['issues']:
+                logger.warning("      - %s", issue)
+            return False
         return True
 
+    async def _bounded_review(self, reviewer: str) -> Dict:
+        """Invoke a reviewer, gated by the module-wide reviewer semaphore."""
+        async with _reviewer_semaphore():
+            return await self.invoke_reviewer(reviewer)
+
     def get_peer_reviewers(self) -> List[str]:
         """Determine which specialists should review this task."""
-        specialist = self.task['specialist']
-        reviewers = []
-
-        # Always review by code reviewer
-        if specialist not in ['code-reviewer', 'code-quality-frontend']:
-            if 'frontend' in specialist or 'ui' in specialist or 'javascript' in specialist:
-                reviewers.append('code-quality-frontend')
-            else:
-                reviewers.append('code-reviewer')
-
-        # Cross-domain review
-        domain_map = {
-            'fastapi-specialist': ['backend-architect'],  # Architect reviews implementation
-            'openai-agents-sdk': ['backend-architect'],
-            'ui-ux': ['code-quality-frontend'],
-            'javascript-specialist': ['code-quality-frontend']
-        }
-
-        if specialist in domain_map:
-            reviewers.extend(domain_map[specialist])
-
-        return reviewers
+        return list(_reviewers_for(self.task['specialist']))
 
     async def invoke_reviewer(self, reviewer: str) -> Dict:
         """
@@ -144,28 +295,28 @@ class CheckpointValidator:
         - Dependencies updated if contracts changed
         - No conflicts with recent decisions
         """
-        print("  [3/4] Running KB sync...")
+        logger.info("  [3/4] Running KB sync...")
 
         # Check if task made KB updates
         kb_updates = self.task.get('kb_updates', [])
 
         if not kb_updates:
-            print("    ℹ No KB updates for this task")
+            logger.info("    ℹ No KB updates for this task")
             return True
 
         # Verify KB files were actually modified
-        for kb_file in kb_updates:
-            if not Path(kb_file).exists():
-                print(f"    ⚠ KB file missing: {kb_file}")
-                return False
+        missing = _missing_files(kb_updates)
+        if missing:
+            logger.warning("    ⚠ KB file missing: %s", missing[0])
+            return False
 
         # Check for decision conflicts
         if 'kb/decisions.log' in kb_updates:
             if not self.check_decision_conflicts():
-                print("    ⚠ Decision conflicts detected")
+                logger.warning("    ⚠ Decision conflicts detected")
                 return False
 
-        print("    ✓ KB sync completed")
+        logger.info("    ✓ KB sync completed")
         return True
 
     def check_decision_conflicts(self) -> bool:
@@ -180,22 +331,21 @@ class CheckpointValidator:
 
         Mark task as validated and prepare next tasks.
         """
-        print("  [4/4] Final approval...")
+        logger.info("  [4/4] Final approval...")
 
         # Update task status to validated
-        self.task['status'] = 'validated'
-
-        # Transition dependent tasks to ready
-        for _task_id, task in self.plan['tasks'].items():
-            if self.task_id in task.get('dependencies', []):
-                deps_satisfied = all(
-                    self.plan['tasks'][dep]['status'] in ['completed', 'validated']
-                    for dep in task['dependencies']
-                )
-                if deps_satisfied and task['status'] == 'pending':
-                    task['status'] = 'ready'
-
-        print("    ✓ Task validated, dependents transitioned to ready")
+        update_task_status(self.plan, self.task_id, 'validated')
+
+        # Transition dependent tasks to ready (only this task's dependents
+        # can have become ready)
+        tasks = self.plan['tasks']
+        for task in tasks.values():
+            if task['status'] != 'pending' or self.task_id not in task['dependencies']:
+                continue
+            if all(tasks[dep]['status'] in DONE_STATUSES for dep in task['dependencies']):
+                task['status'] = 'ready'
+
+        logger.info("    ✓ Task validated, dependents transitioned to ready")
 
 
 async def run_checkpoint(plan: Dict, task_id: str) -> bool:
@@ -0,0 +1,99 @@
+# utils/dag_numba.py
+"""Optional Numba-compiled DAG kernels for large plans."""
+
+from typing import Dict, List, Tuple
+
+try:
+    import numba
+    import numpy as np
+except ImportError:  # optional: kernels run as plain Python instead
+    numba = None
+    np = None
+
+HAVE_NUMBA = numba is not None
+
+
+def _jit(func):
+    """Compile with Numba when available; parallel=False avoids threading-layer setup."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True, parallel=False)(func)
+
+
+def _int_array(values) -> List[int]:
+    """Build an int32 array for the kernels (a plain list without Numba)."""
+    if np is None:
+        return list(values)
+    return np.array(list(values), dtype=np.int32)
+
+
+@_jit
+def critical_path_kernel(indptr, indices, n, depth, remaining, order):
+    """
+    Fill depth with each node's critical-path depth.
+
+    indptr/indices are the dependents graph in CSR form. remaining and
+    order are scratch arrays of length n; depth must start at all ones.
+    Nodes caught in a cycle keep depth 1.
+    """
+    for i in range(n):
+        for k in range(indptr[i], indptr[i + 1]):
+            remaining[indices[k]] += 1
+
+    # Kahn's algorithm: order doubles as the FIFO queue
+    size = 0
+    for i in range(n):
+        if remaining[i] == 0:
+            order[size] = i
+            size += 1
+    head = 0
+    while head < size:
+        node = order[head]
+        head += 1
+        for k in range(indptr[node], indptr[node + 1]):
+            child = indices[k]
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                order[size] = child
+                size += 1
+
+    # Reverse-topological DP
+    for j in range(size - 1, -1, -1):
+        node = order[j]
+        best = 0
+        for k in range(indptr[node], indptr[node + 1]):
+            if depth[indices[k]] > best:
+                best = depth[indices[k]]
+        depth[node] = best + 1
+
+
+def plan_to_csr(plan: Dict) -> Tuple[List[str], List[int], List[int]]:
+    """
+    Map task IDs to indices and return (task_ids, indptr, indices), the
+    dependents graph in CSR form. References to unknown tasks are ignored.
+    """
+    tasks = plan['tasks']
+    task_ids = list(tasks)
+    index = {task_id: i for i, task_id in enumerate(task_ids)}
+
+    children: List[List[int]] = [[] for _ in task_ids]
+    for task_id, task in tasks.items():
+        for dep_id in task['dependencies']:
+            if dep_id in index:
+                children[index[dep_id]].append(index[task_id])
+
+    indptr = [0]
+    indices: List[int] = []
+    for child_list in children:
+        indices.extend(child_list)
+        indptr.append(len(indices))
+    return task_ids, _int_array(indptr), _int_array(indices)
+
+
+def critical_path_depth(plan: Dict) -> Dict[str, int]:
+    """Array-kernel equivalent of dag_parser.compute_critical_path_depth."""
+    task_ids, indptr, indices = plan_to_csr(plan)
+    n = len(task_ids)
+    depth = _int_array([1] * n)
+    critical_path_kernel(indptr, indices, n, depth, _int_array([0] * n), _int_array([0] * n))
+    return {task_id: int(depth[i]) for i, task_id in enumerate(task_ids)}
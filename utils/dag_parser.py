@@ -2,7 +2,19 @@
 """Simple DAG parser for MVP coordinator."""
 
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+
+# Marks the optional dependency suffix of a task line
+_DEPENDS_ON = '(depends on:'
+
+# Task status groups
+READY_STATUSES = frozenset({"pending", "ready"})  # may be scheduled
+DONE_STATUSES = frozenset({"completed", "validated"})  # satisfies dependents
+TERMINAL_STATUSES = frozenset({"completed", "failed", "blocked", "validated"})  # never runs again
+
+# Below this size the JIT call overhead outweighs the pure-Python DP
+_NUMBA_MIN_TASKS = 500
 
 
 class CircularDependencyError(Exception):
@@ -20,37 +32,35 @@ def parse_task_list(task_lines: List[str]) -> Dict:
 
     Returns plan dict matching task-dag.schema.json
     """
-    plan_id = f"plan-{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}"
+    now = datetime.now()
+    plan_id = f"plan-{now.strftime('%Y-%m-%d-%H-%M-%S')}"
     tasks = {}
 
     for i, line in enumerate(task_lines, start=1):
         task_id = f"task-{i}"
 
         # Parse "specialist: description (depends on: X)"
-        if ':' in line:
-            specialist, rest = line.split(':', 1)
-            specialist = specialist.strip().replace(' ', '-')
-
-            # Extract dependencies
-            deps = []
-            if '(depends on:' in rest:
-                desc, dep_str = rest.split('(depends on:')
-                dep_str = dep_str.rstrip(')')
-                deps = [f"task-{d.strip()}" for d in dep_str.split(',')]
-            else:
-                desc = rest
+        parsed = _split_task_line(line)
+        if parsed:
+            specialist, title, dep_list = parsed
+            # De-duplicated in order, so the list has set semantics
+            deps = list(dict.fromkeys(
+                f"task-{d}"
+                for d in map(str.strip, dep_list.split(','))
+                if d
+            ))
 
             tasks[task_id] = {
                 "id": task_id,
-                "title": desc.strip(),
-                "specialist": specialist.lower(),
+                "title": title,
+                "specialist": specialist.strip().replace(' ', '-').lower(),
                 "status": "pending",
                 "dependencies": deps
             }
 
     plan = {
         "plan_id": plan_id,
-        "created_at": datetime.now().isoformat(),
+        "created_at": now.isoformat(),
         "tasks": tasks
     }
 
@@ -60,6 +70,31 @@ def parse_task_list(task_lines: List[str]) -> Dict:
     return plan
 
 
+def _split_task_line(line: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split "specialist: description (depends on: 1, 2)" into its raw
+    (specialist, title, dependency list) parts, or None without a specialist.
+
+    Uses str.partition/find rather than a regex: fixed-string splits are
+    several times cheaper than a backtracking match. The closing
+    parenthesis is optional; text after it means that "(depends on:" was
+    part of the title.
+    """
+    specialist, sep, rest = line.partition(':')
+    if not sep or not specialist:
+        return None
+
+    # The first marker whose list runs to the end of the line (or to a
+    # closing parenthesis with nothing after it) starts the dependencies
+    start = rest.find(_DEPENDS_ON)
+    while start != -1:
+        dep_list, _, trailing = rest[start + len(_DEPENDS_ON):].partition(')')
+        if not trailing.strip():
+            return specialist, rest[:start].strip(), dep_list
+        start = rest.find(_DEPENDS_ON, start + 1)
+    return specialist, rest.strip(), ''
+
+
 def detect_cycles(plan: Dict) -> None:
     """
     Detect circular dependencies in the task DAG.
@@ -67,60 +102,170 @@ def detect_cycles(plan: Dict) -> None:
     Uses DFS with 3-color marking:
     - white (unvisited), gray (in current path), black (fully processed)
 
+    Task IDs are mapped to dense indices first, so the walk runs over int
+    lists and a bytearray instead of string-keyed dicts.
+
     Raises CircularDependencyError with the cycle path if found.
     """
     tasks = plan["tasks"]
+    task_ids = list(tasks)
+    n = len(task_ids)
+    index = dict(zip(task_ids, range(n)))  # built in C, no per-item bytecode
+    deps_idx = [
+        [index[dep_id] for dep_id in tasks[tid].get("dependencies", []) if dep_id in index]
+        for tid in task_ids  # invalid refs are skipped
+    ]
     WHITE, GRAY, BLACK = 0, 1, 2
-    color = {tid: WHITE for tid in tasks}
-    parent = {}
-
-    def dfs(tid: str) -> None:
-        color[tid] = GRAY
-        for dep_id in tasks[tid].get("dependencies", []):
-            if dep_id not in tasks:
-                continue  # skip invalid refs
-            if color[dep_id] == GRAY:
-                # Found a cycle — reconstruct the path
-                cycle = [dep_id, tid]
-                current = tid
-                while current != dep_id:
-                    current = parent.get(current)
-                    if current is None:
-                        break
-                    cycle.append(current)
-                cycle.reverse()
-                raise CircularDependencyError(
-                    f"Circular dependency detected: {' -> '.join(cycle)}"
-                )
-            if color[dep_id] == WHITE:
-                parent[dep_id] = tid
-                dfs(dep_id)
-        color[tid] = BLACK
-
-    for tid in tasks:
-        if color[tid] == WHITE:
-            dfs(tid)
+    color = bytearray(n)
+    parent = [-1] * n
+
+    for root in range(n):
+        if color[root] != WHITE:
+            continue
+        # Explicit stack of (task, remaining dependencies): no recursion
+        # limit on long dependency chains
+        color[root] = GRAY
+        stack = [(root, iter(deps_idx[root]))]
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                if color[dep] == GRAY:
+                    # Found a cycle — reconstruct the path
+                    cycle = [dep, node]
+                    current = node
+                    while current != dep:
+                        current = parent[current]
+                        if current == -1:
+                            break
+                        cycle.append(current)
+                    cycle.reverse()
+                    raise CircularDependencyError(
+                        f"Circular dependency detected: {' -> '.join(task_ids[i] for i in cycle)}"
+                    )
+                if color[dep] == WHITE:
+                    parent[dep] = node
+                    color[dep] = GRAY
+                    stack.append((dep, iter(deps_idx[dep])))
+                    break
+            else:
+                color[node] = BLACK
+                stack.pop()
 
 
 def get_ready_tasks(plan: Dict) -> List[str]:
-    """Return task IDs that are ready to execute (deps satisfied)."""
-    ready = []
-    for task_id, task in plan["tasks"].items():
-        if task["status"] in ("pending", "ready"):
-            deps_satisfied = all(
-                plan["tasks"][dep_id]["status"] in ("completed", "validated")
-                for dep_id in task["dependencies"]
-                if dep_id in plan["tasks"]
-            )
-            if deps_satisfied:
-                ready.append(task_id)
-    return ready
-
-
-def update_task_status(plan: Dict, task_id: str, status: str) -> None:
-    """Update task status in plan."""
-    plan["tasks"][task_id]["status"] = status
+    """
+    Return task IDs that are ready to execute (deps satisfied).
+
+    A full scan of the plan's current statuses, for callers inspecting a
+    plan; ParallelExecutor tracks readiness incrementally instead of
+    calling this per scheduling round.
+    """
+    tasks = plan["tasks"]
+    return [
+        task_id for task_id, task in tasks.items()
+        if task["status"] in READY_STATUSES
+        and all(
+            tasks[dep_id]["status"] in DONE_STATUSES
+            for dep_id in task["dependencies"]
+            if dep_id in tasks
+        )
+    ]
+
+
+def build_dependents_index(plan: Dict) -> Dict[str, List[str]]:
+    """Return a reverse-dependency index: task ID -> IDs of tasks depending on it."""
+    tasks = plan["tasks"]
+    dependents = {task_id: [] for task_id in tasks}
+    for task_id, task in tasks.items():
+        for dep_id in task["dependencies"]:
+            if dep_id in dependents:
+                dependents[dep_id].append(task_id)
+    return dependents
+
+
+def compute_indegrees(plan: Dict) -> Dict[str, int]:
+    """Return the number of not-yet-satisfied dependencies for each task."""
+    tasks = plan["tasks"]
+    return {
+        task_id: sum(
+            1 for dep_id in task["dependencies"]
+            if dep_id in tasks
+            and tasks[dep_id]["status"] not in DONE_STATUSES
+        )
+        for task_id, task in tasks.items()
+    }
+
+
+def compute_critical_path_depth(plan: Dict) -> Dict[str, int]:
+    """
+    Return each task's critical-path depth: the number of tasks on the
+    longest dependency chain starting at it (a task with no dependents is 1).
+
+    Computed with a reverse-topological DP; tasks caught in a cycle keep
+    the default depth of 1. Large plans use the Numba kernel in dag_numba
+    when Numba is installed.
+    """
+    tasks = plan["tasks"]
+    if len(tasks) >= _NUMBA_MIN_TASKS:
+        # Imported here: loading numba/numpy costs more than small plans save
+        from . import dag_numba
+        if dag_numba.HAVE_NUMBA:
+            return dag_numba.critical_path_depth(plan)
+
+    dependents = build_dependents_index(plan)
+    depth = dict.fromkeys(tasks, 1)
+    for task_id in reversed(_topological_order(plan, dependents)):
+        depth[task_id] = 1 + max((depth[c] for c in dependents[task_id]), default=0)
+    return depth
+
+
+def compute_root_depth(plan: Dict) -> Dict[str, int]:
+    """
+    Return each task's distance from the roots: the number of tasks on the
+    longest dependency chain leading to it (a task with no dependencies is 0).
+
+    Tasks caught in a cycle keep the default depth of 0.
+    """
+    tasks = plan["tasks"]
+    dependents = build_dependents_index(plan)
+    level = dict.fromkeys(tasks, 0)
+    for task_id in _topological_order(plan, dependents):
+        for child_id in dependents[task_id]:
+            level[child_id] = max(level[child_id], level[task_id] + 1)
+    return level
+
+
+def _topological_order(plan: Dict, dependents: Dict[str, List[str]]) -> List[str]:
+    """Kahn's algorithm over the dependents index; tasks in cycles are omitted."""
+    tasks = plan["tasks"]
+    remaining = {
+        task_id: sum(1 for dep_id in task["dependencies"] if dep_id in tasks)
+        for task_id, task in tasks.items()
+    }
+    order = [task_id for task_id, count in remaining.items() if count == 0]
+    for task_id in order:
+        for child_id in dependents[task_id]:
+            remaining[child_id] -= 1
+            if remaining[child_id] == 0:
+                order.append(child_id)
+    return order
+
+
+def update_task_status(
+    plan: Dict,
+    task_id: str,
+    status: str,
+    when: Optional[datetime] = None
+) -> None:
+    """
+    Update task status in plan.
+
+    `when` stamps the transition (default: now); pass one shared value
+    when updating several tasks together.
+    """
+    task = plan["tasks"][task_id]
+    task["status"] = status
     if status == "in-progress":
-        plan["tasks"][task_id]["started_at"] = datetime.now().isoformat()
-    elif status in ["completed", "failed", "blocked", "validated"]:
-        plan["tasks"][task_id]["completed_at"] = datetime.now().isoformat()
+        task["started_at"] = (when or datetime.now()).isoformat()
+    elif status in TERMINAL_STATUSES:
+        task["completed_at"] = (when or datetime.now()).isoformat()
@@ -1,13 +1,41 @@
 # utils/error_recovery.py
 """Adaptive error recovery for specialist task failures."""
 
-from typing import Dict
+import re
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
 from enum import Enum
+from .dag_parser import build_dependents_index, update_task_status
 
 class FailureType(Enum):
     FIXABLE = "fixable"
     FUNDAMENTAL = "fundamental"
 
+# Fixable indicators
+FIXABLE_KEYWORDS = (
+    'unclear', 'missing', 'not found', 'undefined',
+    'need more', 'clarification', 'incomplete'
+)
+
+# Fundamental indicators
+FUNDAMENTAL_KEYWORDS = (
+    'impossible', 'conflict', 'incompatible',
+    'architecture', 'cannot', 'violation'
+)
+
+# Both keyword sets compiled into one alternation, so an error message is
+# scanned once; the named group tells which set matched. Keywords must
+# start a word ("conflicts" matches, "preconflict" doesn't) but may be
+# inflected, so there is no trailing boundary.
+_CLASSIFIER_RE = re.compile(
+    r'\b(?:'
+    '(?P<fundamental>' + '|'.join(map(re.escape, FUNDAMENTAL_KEYWORDS)) + ')'
+    '|(?P<fixable>' + '|'.join(map(re.escape, FIXABLE_KEYWORDS)) + ')'
+    ')',
+    re.IGNORECASE
+)
+
 class ErrorRecovery:
     """Handles specialist task failures with adaptive recovery."""
 
@@ -16,6 +44,7 @@ class ErrorRecovery:
         self.task = plan['tasks'][task_id]
         self.task_id = task_id
         self.max_retries = 3
+        self._downstream: Optional[List[str]] = None
 
     async def handle_failure(self, error: Exception) -> bool:
         """
@@ -64,24 +93,13 @@ class ErrorRecovery:
         - Architectural conflict
         - Impossible requirement
         """
-        error_msg = str(error).lower()
-
-        # Fixable indicators
-        fixable_keywords = [
-            'unclear', 'missing', 'not found', 'undefined',
-            'need more', 'clarification', 'incomplete'
-        ]
-
-        # Fundamental indicators
-        fundamental_keywords = [
-            'impossible', 'conflict', 'incompatible',
-            'architecture', 'cannot', 'violation'
-        ]
-
-        if any(kw in error_msg for kw in fundamental_keywords):
-            return FailureType.FUNDAMENTAL
+        fixable_match = False
+        for match in _CLASSIFIER_RE.finditer(str(error)):
+            if match.lastgroup == 'fundamental':
+                return FailureType.FUNDAMENTAL
+            fixable_match = True
 
-        if any(kw in error_msg for kw in fixable_keywords):
+        if fixable_match:
             return FailureType.FIXABLE
 
         # Default to fixable if under retry limit
@@ -224,21 +242,45 @@ class ErrorRecovery:
 
     def block_task_and_dependents(self) -> None:
         """Block failed task and all downstream dependents."""
-        self.task['status'] = 'blocked'
+        # One timestamp for the whole cascade
+        now = datetime.now()
+        update_task_status(self.plan, self.task_id, 'blocked', when=now)
 
-        # Block all tasks that depend on this one
-        for task_id, task in self.plan['tasks'].items():
-            if self.task_id in task.get('dependencies', []):
-                task['status'] = 'blocked'
-                print(f"    Blocked dependent task: {task_id}")
+        # Block all tasks that depend on this one, directly or transitively
+        for task_id in self.find_downstream_tasks():
+            update_task_status(self.plan, task_id, 'blocked', when=now)
+            print(f"    Blocked dependent task: {task_id}")
+
+    def find_downstream_tasks(self) -> List[str]:
+        """
+        Return IDs of all tasks downstream of the failed task, nearest first.
+
+        Walks the dependents index breadth-first, so the cost is the size
+        of the affected subtree rather than a scan of the whole plan. The
+        result is computed once per recovery, since blocking and the
+        failure report both need it.
+        """
+        if self._downstream is not None:
+            return self._downstream
+
+        dependents = build_dependents_index(self.plan)
+
+        seen = {self.task_id}
+        downstream = []
+        queue = deque([self.task_id])
+        while queue:
+            for child_id in dependents.get(queue.popleft(), []):
+                if child_id not in seen:
+                    seen.add(child_id)
+                    downstream.append(child_id)
+                    queue.append(child_id)
+        self._downstream = downstream
+        return downstream
 
     def generate_failure_report(self, context: Dict) -> str:
         """Generate detailed failure report for user."""
         # Find dependent tasks
-        dependent_tasks = []
-        for task_id, task in self.plan['tasks'].items():
-            if self.task_id in task.get('dependencies', []):
-                dependent_tasks.append(task_id)
+        dependent_tasks = self.find_downstream_tasks()
 
         report = f"""
 Task Failed: {self.task['title']}
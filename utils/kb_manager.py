@@ -1,13 +1,44 @@
 # utils/kb_manager.py
 """Knowledge base initialization and management."""
 
+import asyncio
+import atexit
+import errno
+import functools
 import json
+import os
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
+# O_APPEND descriptor for decisions.log, opened on first use and kept open.
+# Each decision is one unbuffered os.write, which POSIX appends atomically,
+# so entries from concurrent processes can't interleave. The lock guards
+# switching descriptors, since alog_decision writes from worker threads.
+# At most every _LOG_RECHECK_SECONDS (and after ENOENT/ESTALE) the
+# descriptor is checked against the path, so a deleted or rotated log is
+# reopened rather than written to the old inode.
+_log_fd: Optional[int] = None
+_log_path: Optional[Path] = None
+_log_checked_at = 0.0
+_log_lock = threading.Lock()
+_LOG_RECHECK_SECONDS = 1.0
 
+# (epoch minute, formatted timestamp) of the last logged decision. Entries
+# only carry minute precision, so strftime runs once per minute; the tuple
+# is swapped in with one assignment, so racing threads at worst both format.
+_minute_stamp = (None, "")
+
+
+@functools.lru_cache(maxsize=1)
 def _get_kb_dir() -> Path:
-    """Get KB directory relative to the plugin root, not the CWD."""
+    """
+    Get KB directory relative to the plugin root, not the CWD.
+
+    Cached: resolve() hits the filesystem and the answer never changes.
+    """
     # Look for kb/ relative to this file's location (the plugin root)
     plugin_root = Path(__file__).resolve().parent.parent
     return plugin_root / "kb"
@@ -16,24 +47,33 @@ def _get_kb_dir() -> Path:
 def initialize_kb(kb_dir: Optional[Path] = None):
     """Create KB directory structure if it doesn't exist."""
     kb = kb_dir or _get_kb_dir()
-    kb.mkdir(exist_ok=True)
+    kb.mkdir(parents=True, exist_ok=True)
 
     # Create empty pattern files if they don't exist
     patterns = ["backend-patterns.md", "frontend-patterns.md", "api-contracts.md"]
     for pattern in patterns:
-        path = kb / pattern
-        if not path.exists():
-            path.write_text(f"# {pattern.replace('-', ' ').title()}\n\n")
+        _create_if_missing(kb / pattern, f"# {pattern.replace('-', ' ').title()}\n\n")
 
     # Create empty decisions log
-    log_path = kb / "decisions.log"
-    if not log_path.exists():
-        log_path.write_text("# Decision Log\n\n")
+    _create_if_missing(kb / "decisions.log", "# Decision Log\n\n")
 
     # Create empty dependencies graph
-    deps_path = kb / "dependencies.json"
-    if not deps_path.exists():
-        deps_path.write_text(json.dumps({}, indent=2))
+    _create_if_missing(kb / "dependencies.json", json.dumps({}, indent=2))
+
+
+def _create_if_missing(path: Path, content: str) -> None:
+    """
+    Write content to path unless the file already exists.
+
+    O_CREAT | O_EXCL makes existence check and creation one syscall, so an
+    already-initialized KB costs one failed open per file.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
 
 
 def verify_kb_exists(kb_dir: Optional[Path] = None) -> bool:
@@ -43,12 +83,15 @@ def verify_kb_exists(kb_dir: Optional[Path] = None) -> bool:
 
 
 def log_decision(specialist: str, decision: str, rationale: str, affects: List[str], ref: str = "", kb_dir: Optional[Path] = None):
-    """Append decision to KB log."""
-    from datetime import datetime
+    """
+    Append decision to KB log.
 
+    Each entry is a single atomic append, visible to readers immediately;
+    call flush_decision_log() when it must also survive a crash.
+    """
     kb = kb_dir or _get_kb_dir()
     log_path = kb / "decisions.log"
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    timestamp = _minute_timestamp()
 
     entry = f"[{timestamp}] [{specialist}] Decision: {decision}\n"
     entry += f"Rationale: {rationale}\n"
@@ -57,5 +100,85 @@ def log_decision(specialist: str, decision: str, rationale: str, affects: List[s
         entry += f"Ref: {ref}\n"
     entry += "\n"
 
-    with log_path.open('a') as f:
-        f.write(entry)
+    data = entry.encode('utf-8')
+    with _log_lock:
+        fd = _decision_log_fd(log_path)
+        try:
+            _write_all(fd, data)
+        except OSError as e:
+            if e.errno not in (errno.ENOENT, errno.ESTALE):
+                raise
+            # The file went away under the descriptor: reopen and retry
+            _close_decision_log()
+            _write_all(_decision_log_fd(log_path), data)
+
+
+def _decision_log_fd(log_path: Path) -> int:
+    """
+    Return the O_APPEND descriptor for log_path, (re)opening it on first
+    use, for a different KB directory, or when a periodic check finds the
+    log was deleted or rotated. Call with _log_lock held.
+    """
+    global _log_fd, _log_path, _log_checked_at
+    now = time.monotonic()
+    if _log_path == log_path and now - _log_checked_at < _LOG_RECHECK_SECONDS:
+        return _log_fd
+    if _log_path != log_path or not _log_fd_current(log_path):
+        _close_decision_log()
+        _log_fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        _log_path = log_path
+    _log_checked_at = now
+    return _log_fd
+
+
+def _log_fd_current(log_path: Path) -> bool:
+    """Check that the cached descriptor still refers to the file at log_path."""
+    try:
+        st = os.stat(log_path)
+    except FileNotFoundError:
+        return False
+    fd_st = os.fstat(_log_fd)
+    return (st.st_ino, st.st_dev) == (fd_st.st_ino, fd_st.st_dev)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write until every byte is written (a short write is otherwise silent)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _minute_timestamp() -> str:
+    """Current local time as "%Y-%m-%d %H:%M", formatted once per minute."""
+    global _minute_stamp
+    now = time.time()
+    minute = int(now // 60)
+    key, stamp = _minute_stamp
+    if minute != key:
+        stamp = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M")
+        _minute_stamp = (minute, stamp)
+    return stamp
+
+
+def flush_decision_log() -> None:
+    """Force logged decisions to disk (fsync)."""
+    with _log_lock:
+        if _log_fd is not None:
+            os.fsync(_log_fd)
+
+
+def _close_decision_log() -> None:
+    """Close the cached decisions.log descriptor, if open."""
+    global _log_fd, _log_path
+    if _log_fd is not None:
+        os.close(_log_fd)
+    _log_fd = None
+    _log_path = None
+
+
+atexit.register(_close_decision_log)
+
+
+async def alog_decision(specialist: str, decision: str, rationale: str, affects: List[str], ref: str = "", kb_dir: Optional[Path] = None):
+    """Append decision to KB log without blocking the event loop."""
+    await asyncio.to_thread(log_decision, specialist, decision, rationale, affects, ref, kb_dir)
@@ -2,42 +2,202 @@
 """Parallel task execution engine for coordinator."""
 
 import asyncio
-from typing import Dict, Set
-from .dag_parser import get_ready_tasks, update_task_status
+import itertools
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+from .dag_parser import (
+    READY_STATUSES,
+    TERMINAL_STATUSES,
+    build_dependents_index,
+    compute_critical_path_depth,
+    compute_indegrees,
+    compute_root_depth,
+    update_task_status,
+)
+
+
+def maybe_use_uvloop() -> bool:
+    """
+    Switch asyncio to uvloop when COORDINATOR_UVLOOP=1 and it is installed.
+
+    Sets the process-wide event loop policy, so only the coordinator entry
+    point should call it, before starting its event loop.
+    """
+    if os.environ.get('COORDINATOR_UVLOOP') != '1':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+# Specialist transport: called with specialist=, task_title=, task_id=
+Invoker = Callable[..., Awaitable[Dict]]
+
+
+async def _default_invoker(specialist: str, task_title: str, task_id: str) -> Dict:
+    """
+    Demo-only transport: pretends to run the specialist for two seconds.
+
+    The real coordinator spawns the specialist agent via the Task tool;
+    pass an invoker to ParallelExecutor to plug that (or a test stub) in.
+    """
+    print(f"[Parallel Executor] Invoking {specialist} for {task_id}")
+
+    # Simulate work
+    await asyncio.sleep(2)
+
+    return {
+        'task_id': task_id,
+        'specialist': specialist,
+        'output': f'Completed {task_title}',
+        'workspace_files': [f'work/{task_id}-output.md'],
+        'kb_updates': []
+    }
+
+
+def _encode_checkpoint(record: Dict) -> bytes:
+    """Serialize one checkpoint record as a newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + '\n').encode()
+
+
+def _flush_checkpoints(path: Path, records: List[Dict]) -> None:
+    """Append checkpoint records as JSON lines with a single write and fsync."""
+    # Encode everything first, so a bad record leaves the file untouched
+    data = b''.join(map(_encode_checkpoint, records))
+    with open(path, 'ab') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
 
 class ParallelExecutor:
     """Executes tasks in parallel based on DAG dependencies."""
 
-    def __init__(self, plan: Dict):
+    def __init__(
+        self,
+        plan: Dict,
+        checkpoint_path: Optional[Path] = None,
+        invoker: Optional[Invoker] = None
+    ):
         self.plan = plan
+        self.invoker = invoker or _default_invoker
+
         self.running_tasks: Set[str] = set()
-        self.max_parallel = 3  # Max concurrent specialist invocations
+
+        # Optional JSONL checkpoint log for resumability. Records are buffered
+        # and flushed once per scheduler wake-up rather than per task.
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self._checkpoint_buffer: List[Dict] = []
+        # Max concurrent specialist invocations
+        self.max_parallel = int(os.environ.get('COORDINATOR_MAX_PARALLEL', '3'))
+
+        # Bounds specialist invocations even when execute_task is driven
+        # directly rather than through execute_plan's worker pool. Sized from
+        # max_parallel when first needed, so later changes to it still apply.
+        self._invoke_sem: Optional[asyncio.Semaphore] = None
+
+        # Event-driven scheduling state: completing a task decrements its
+        # dependents' in-degree and queues any that reach zero
+        self.dependents = build_dependents_index(plan)
+        self.indegree = compute_indegrees(plan)
+
+        # Ready tasks are queued by critical-path depth (longest downstream
+        # chain first), then by distance from the roots (shallowest first, to
+        # expose parallelism early), then by insertion order, and drained by
+        # a pool of max_parallel workers
+        self.depth = compute_critical_path_depth(plan)
+        self.level = compute_root_depth(plan)
+        self._ready: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._ready_seq = itertools.count()
+
+        # Set when checkpoint records are buffered; wakes the flusher
+        self._checkpoint_dirty = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
 
     async def execute_plan(self) -> None:
         """Execute all tasks in plan with parallelization."""
-        while not self.is_plan_complete():
-            ready_tasks = get_ready_tasks(self.plan)
-
-            # Filter out tasks already running
-            ready_tasks = [t for t in ready_tasks if t not in self.running_tasks]
-
-            if not ready_tasks:
-                # No ready tasks, wait for running tasks to complete
-                if self.running_tasks:
-                    await asyncio.sleep(1)
-                    continue
-                else:
-                    # No ready tasks and nothing running = blocked or complete
-                    break
-
-            # Launch tasks in parallel (up to max_parallel)
-            tasks_to_launch = ready_tasks[:self.max_parallel - len(self.running_tasks)]
-
-            for task_id in tasks_to_launch:
-                asyncio.create_task(self.execute_task(task_id))
-                self.running_tasks.add(task_id)
-
-            await asyncio.sleep(0.5)  # Brief pause before next iteration
+        if self.is_plan_complete():
+            return
+
+        # Seed the ready queue with tasks whose dependencies are satisfied
+        tasks = self.plan['tasks']
+        for task_id, count in self.indegree.items():
+            if count == 0 and tasks[task_id]['status'] in READY_STATUSES:
+                self._push_ready(task_id)
+
+        # Workers re-queue dependents before marking a task done, so the
+        # queue only drains once no runnable work is left
+        self._invoke_sem = asyncio.Semaphore(self.max_parallel)
+        helpers = [asyncio.create_task(self._worker()) for _ in range(self.max_parallel)]
+        if self.checkpoint_path is not None:
+            helpers.append(asyncio.create_task(self._checkpoint_flusher()))
+        try:
+            await self._ready.join()
+        finally:
+            for helper in helpers:
+                helper.cancel()
+            results = await asyncio.gather(*helpers, return_exceptions=True)
+
+        # Cancellation is expected; anything else (e.g. a failed checkpoint
+        # flush that stopped the flusher) must not pass silently
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        await self.flush_checkpoints()
+
+    async def _worker(self) -> None:
+        """Run queued tasks one at a time, highest priority first."""
+        tasks = self.plan['tasks']
+        running = self.running_tasks
+        ready = self._ready
+        execute_task = self.execute_task
+        while True:
+            *_priority, task_id = await ready.get()
+            try:
+                # Skip stale entries (already started or finished elsewhere)
+                if task_id not in running and \
+                        tasks[task_id]['status'] in READY_STATUSES:
+                    running.add(task_id)
+                    await execute_task(task_id)
+            finally:
+                ready.task_done()
+
+    async def _checkpoint_flusher(self) -> None:
+        """Flush buffered checkpoint records once per batch of completions."""
+        while True:
+            await self._checkpoint_dirty.wait()
+            self._checkpoint_dirty.clear()
+            # Let completions from the same loop iteration join the batch
+            await asyncio.sleep(0)
+            await asyncio.shield(self.flush_checkpoints())
+
+    async def flush_checkpoints(self) -> None:
+        """Persist buffered checkpoint records in one write, off the event loop."""
+        async with self._flush_lock:
+            if not self._checkpoint_buffer:
+                return
+            records, self._checkpoint_buffer = self._checkpoint_buffer, []
+            try:
+                await asyncio.to_thread(_flush_checkpoints, self.checkpoint_path, records)
+            except Exception:
+                # Keep the records (ahead of newer ones) for the next flush
+                self._checkpoint_buffer[:0] = records
+                raise
 
     async def execute_task(self, task_id: str) -> None:
         """Execute a single task via specialist invocation."""
@@ -45,30 +205,63 @@ class ParallelExecutor:
 
         try:
             # Update status to in-progress
-            update_task_status(self.plan, task_id, 'in-progress')
+            self._set_status(task_id, 'in-progress')
 
             # Invoke specialist (placeholder - actual implementation uses Task tool)
-            result = await self.invoke_specialist(
-                specialist=task['specialist'],
-                task_title=task['title'],
-                task_id=task_id
-            )
+            if self._invoke_sem is None:
+                self._invoke_sem = asyncio.Semaphore(self.max_parallel)
+            async with self._invoke_sem:
+                result = await self.invoke_specialist(
+                    specialist=task['specialist'],
+                    task_title=task['title'],
+                    task_id=task_id
+                )
 
             # Run checkpoint
             await self.run_checkpoint(task_id, result)
 
-            # Update status to completed
-            update_task_status(self.plan, task_id, 'completed')
+            # Update status to completed (releases dependents)
+            self._set_status(task_id, 'completed')
 
         except Exception as e:
             # Handle failure
-            update_task_status(self.plan, task_id, 'failed')
+            self._set_status(task_id, 'failed')
             task['error_context'] = str(e)
 
         finally:
             # Remove from running set
             self.running_tasks.discard(task_id)
 
+    def _set_status(self, task_id: str, status: str) -> None:
+        """
+        Single write point for task status changes made by the executor.
+
+        Records the change (and its timestamps) on the plan and updates the
+        scheduler's own state in the same step: on completion, the
+        in-degrees and ready queue of dependent tasks.
+        """
+        update_task_status(self.plan, task_id, status)
+        if status == 'completed':
+            self._release_dependents(task_id)
+
+    def _release_dependents(self, task_id: str) -> None:
+        """Decrement dependents' in-degree and queue any that become ready."""
+        tasks = self.plan['tasks']
+        indegree = self.indegree
+        for child_id in self.dependents.get(task_id, []):
+            indegree[child_id] -= 1
+            if indegree[child_id] == 0 and tasks[child_id]['status'] in READY_STATUSES:
+                self._push_ready(child_id)
+
+    def _push_ready(self, task_id: str) -> None:
+        """Queue a ready task, prioritized by critical-path depth, then root distance."""
+        self._ready.put_nowait((
+            -self.depth.get(task_id, 1),
+            self.level.get(task_id, 0),
+            next(self._ready_seq),
+            task_id
+        ))
+
     async def invoke_specialist(
         self,
         specialist: str,
@@ -76,9 +269,10 @@ class ParallelExecutor:
         task_id: str
     ) -> Dict:
         """
-        Invoke specialist via Task tool.
+        Invoke specialist via the executor's invoker.
 
-        In actual implementation, this uses the Task tool to spawn specialist agent.
+        In actual implementation, the invoker uses the Task tool to spawn
+        the specialist agent.
         Specialist receives:
         - Task title and description
         - Workspace files from predecessor tasks
@@ -86,19 +280,11 @@ class ParallelExecutor:
 
         Returns specialist output.
         """
-        # Placeholder - actual implementation uses Task tool
-        print(f"[Parallel Executor] Invoking {specialist} for {task_id}")
-
-        # Simulate work
-        await asyncio.sleep(2)
-
-        return {
-            'task_id': task_id,
-            'specialist': specialist,
-            'output': f'Completed {task_title}',
-            'workspace_files': [f'work/{task_id}-output.md'],
-            'kb_updates': []
-        }
+        return await self.invoker(
+            specialist=specialist,
+            task_title=task_title,
+            task_id=task_id
+        )
 
     async def run_checkpoint(self, task_id: str, result: Dict) -> None:
         """
@@ -126,24 +312,40 @@ class ParallelExecutor:
         task['output_workspace'] = ','.join(workspace_files)
         task['kb_updates'] = kb_updates
 
+        if self.checkpoint_path is not None:
+            self._checkpoint_buffer.append({
+                'task_id': task_id,
+                'result': result,
+                'ts': datetime.now().isoformat()
+            })
+            self._checkpoint_dirty.set()
+
         print(f"[Checkpoint] {task_id} validated ✓")
 
     def is_plan_complete(self) -> bool:
-        """Check if all tasks are completed or blocked."""
-        statuses = [task['status'] for task in self.plan['tasks'].values()]
-        return all(s in ['completed', 'failed', 'blocked', 'validated'] for s in statuses)
+        """
+        Check if all tasks are completed or blocked.
+
+        Scans the plan, since error recovery and checkpoints update task
+        statuses directly. The scan stops at the first unfinished task.
+        """
+        return all(
+            task['status'] in TERMINAL_STATUSES
+            for task in self.plan['tasks'].values()
+        )
 
 
-async def execute_plan_parallel(plan: Dict) -> Dict:
+async def execute_plan_parallel(plan: Dict, invoker: Optional[Invoker] = None) -> Dict:
     """
     Execute plan with parallel task orchestration.
 
     Args:
         plan: Plan dict from auto_planner or manual parsing
+        invoker: Specialist transport (default: the demo-only placeholder)
 
     Returns:
         Updated plan with task statuses and results
     """
-    executor = ParallelExecutor(plan)
+    executor = ParallelExecutor(plan, invoker=invoker)
     await executor.execute_plan()
     return executor.plan
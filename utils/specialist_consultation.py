@@ -1,6 +1,7 @@
 # utils/specialist_consultation.py
 """Utilities for coordinator to consult specialists during planning."""
 
+import asyncio
 from typing import Dict, List
 import json
 
@@ -81,13 +82,18 @@ async def consult_all_relevant_specialists(
         'kb_state': kb_state
     }
 
-    responses = {}
-    for specialist in specialists_to_consult:
-        question = get_consultation_question(specialist, feature_description)
-        response = await consult_specialist(specialist, question, context)
-        responses[specialist] = response
-
-    return responses
+    # Consultations are independent, so they run concurrently
+    specialists = list(specialists_to_consult)
+    results = await asyncio.gather(*(
+        consult_specialist(
+            specialist,
+            get_consultation_question(specialist, feature_description),
+            context
+        )
+        for specialist in specialists
+    ))
+
+    return dict(zip(specialists, results))
 
 
 def get_consultation_question(specialist: str, feature_description: str) -> str: